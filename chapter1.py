@@ -1,5 +1,11 @@
 from manim import *
 
+from deck import CompactPlane, TransformSpace, ViewportPlane, sharing, tex_cache, text_cache
+
+tex_cache.install()
+text_cache.install()
+sharing.install()
+
 WAIT_TIME = 0.5
 
 
@@ -55,7 +61,7 @@ class VectorConcepts(Scene):
         # Slide 4: Mathematics Example - Vector with a Transforming Grid
         label = Text("Mathematics: Abstract Vector Space",
                      font_size=36).shift(UP * 3)
-        grid = NumberPlane(
+        grid = ViewportPlane(
             x_range=[-20, 20], y_range=[-20, 20],
             background_line_style={"stroke_opacity": 0.4}
         )
@@ -82,9 +88,8 @@ class VectorConcepts(Scene):
         transform_matrix = [[0, 1], [1, 0]]  # Simple rotation/flip matrix
 
         self.play(
-            grid.animate.apply_matrix(transform_matrix),
-            math_vector_u.animate.apply_matrix(transform_matrix),
-            math_vector_v.animate.apply_matrix(transform_matrix),
+            TransformSpace(transform_matrix, grid, math_vector_u,
+                           math_vector_v, run_time=1),
             math_annotation_u.animate.move_to(math_vector_v.get_end()),
             math_annotation_v.animate.move_to(math_vector_u.get_end())
         )
@@ -143,7 +148,7 @@ class VectorAddition(Scene):
         vector_sum_annotation = MathTex(
             r"\vec{A} + \vec{B} = \begin{bmatrix} 3 \\ 2 \end{bmatrix}").next_to(vector_sum.get_end())
 
-        grid = NumberPlane()
+        grid = CompactPlane()
 
         # Creating the arrows
         self.play(GrowArrow(vector_A), GrowArrow(vector_B), FadeIn(grid),
@@ -229,7 +234,7 @@ class ScalarMultiplication(Scene):
         self.play(FadeOut(explanation))
 
         # Slide 3: Example of Scalar Multiplication
-        grid = NumberPlane()
+        grid = CompactPlane()
         vector = Vector(2 * RIGHT + 1 * UP, color=BLUE)
         vector_annotation = MathTex(
             r"\vec{v} = \begin{bmatrix} 2 \\ 1 \end{bmatrix}").next_to(vector.get_end(), RIGHT)
@@ -1,5 +1,12 @@
 from manim import *
 
+from deck import (ApplyPointsFunction, ColumnMatrix, CompactPlane, CoordinateLabel,
+                  TransformSpace, ViewportPlane, sharing, tex_cache, text_cache)
+
+tex_cache.install()
+text_cache.install()
+sharing.install()
+
 WAIT_TIME = 0.5
 
 
@@ -18,16 +25,16 @@ class IntroToLinearTransformation(Scene):
         self.next_section(name="Visualizing Transformation",
                           skip_animations=False)
         self.play(FadeOut(title), FadeOut(subtitle))
-        grid = NumberPlane(
+        grid = ViewportPlane(
             x_range=[-20, 20], y_range=[-20, 20],
             background_line_style={"stroke_opacity": 0.4}
         )
 
         # Initial vector
         vector = Vector([1, 2], color=YELLOW)
-        vector_label = vector.coordinate_label().next_to(vector.get_end())
-        vector_label.add_updater(lambda m: m.become(
-            vector.coordinate_label().next_to(vector.get_end())))
+        vector_label = CoordinateLabel(vector).next_to(vector.get_end())
+        vector_label.add_updater(
+            lambda m: m.refresh().next_to(vector.get_end()))
 
         self.play(FadeIn(grid), GrowArrow(vector), Write(vector_label))
         self.wait(WAIT_TIME)
@@ -50,8 +57,7 @@ class IntroToLinearTransformation(Scene):
         # vector = matrix.dot(vector)
 
         self.play(
-            ApplyMatrix(matrix, vector),
-            ApplyMatrix(matrix, grid)
+            TransformSpace(matrix, vector, grid),
         )
         self.wait(WAIT_TIME)
 
@@ -81,8 +87,7 @@ class IntroToLinearTransformation(Scene):
 
         # vector = matrix_2.dot(vector)
         self.play(
-            ApplyMatrix(matrix_2, vector),
-            ApplyMatrix(matrix_2, grid)
+            TransformSpace(matrix_2, vector, grid),
         )
         self.wait(WAIT_TIME)
 
@@ -114,7 +119,7 @@ class VisualizingTransformations(Scene):
         self.wait(WAIT_TIME)
 
         # Slide 2: Grid and Image Setup
-        grid = NumberPlane(
+        grid = ViewportPlane(
             x_range=[-20, 20], y_range=[-20, 20],
             background_line_style={"stroke_opacity": 0.4}
         )
@@ -157,10 +162,7 @@ class VisualizingTransformations(Scene):
         self.next_section(name="Applying Transformation",
                           skip_animations=False)
         self.play(
-            ApplyMatrix(shear_matrix, shape_group),
-            ApplyMatrix(shear_matrix, grid),
-            ApplyMatrix(shear_matrix, i_hat),
-            ApplyMatrix(shear_matrix, j_hat),
+            TransformSpace(shear_matrix, shape_group, grid, i_hat, j_hat),
         )
 
         self.wait(WAIT_TIME)
@@ -193,10 +195,7 @@ class VisualizingTransformations(Scene):
         self.next_section(name="Applying Rotation Transformation",
                           skip_animations=False)
         self.play(
-            ApplyMatrix(rotation_matrix, shape_group),
-            ApplyMatrix(rotation_matrix, grid),
-            ApplyMatrix(rotation_matrix, i_hat),
-            ApplyMatrix(rotation_matrix, j_hat),
+            TransformSpace(rotation_matrix, shape_group, grid, i_hat, j_hat),
         )
         self.wait(WAIT_TIME)
 
@@ -234,9 +233,11 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
         self.play(Write(section1_text))
 
         # Setup grid and basis vectors
-        grid = NumberPlane(
+        # Only ever transformed linearly, so it can follow the zooming frame
+        grid = ViewportPlane(
             x_range=[-30, 30], y_range=[-30, 30],
-            background_line_style={"stroke_opacity": 0.4}
+            background_line_style={"stroke_opacity": 0.4},
+            frame=self.camera.frame
         )
         i_hat = Vector(RIGHT, color=RED)
         j_hat = Vector(UP, color=BLUE)
@@ -261,9 +262,7 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
         # Apply a linear transformation
         shear_matrix_1 = [[1, 1], [0, 1]]
         self.play(
-            ApplyMatrix(shear_matrix_1, grid),
-            ApplyMatrix(shear_matrix_1, i_hat),
-            ApplyMatrix(shear_matrix_1, j_hat),
+            TransformSpace(shear_matrix_1, grid, i_hat, j_hat),
         )
         self.next_section(name="Fixed Origin", skip_animations=False)
         self.wait(WAIT_TIME)
@@ -271,9 +270,7 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
         # Apply another linear transformation
         shear_matrix_2 = [[1, 0], [1, 1]]
         self.play(
-            ApplyMatrix(shear_matrix_2, grid),
-            ApplyMatrix(shear_matrix_2, i_hat),
-            ApplyMatrix(shear_matrix_2, j_hat),
+            TransformSpace(shear_matrix_2, grid, i_hat, j_hat),
         )
         self.next_section(name="Fixed Origin", skip_animations=False)
         self.wait(WAIT_TIME)
@@ -325,7 +322,7 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
         self.play(Write(section2_text))
 
         # Reset grid and basis vectors
-        grid = NumberPlane(
+        grid = CompactPlane(
             x_range=[-30, 30], y_range=[-30, 30],
             background_line_style={"stroke_opacity": 0.4}
         )
@@ -350,10 +347,7 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
         # Apply a linear transformation to demonstrate lines remain straight and parallel
         shear_matrix_3 = [[1, 2], [0, 1]]
         self.play(
-            ApplyMatrix(shear_matrix_3, grid),
-            ApplyMatrix(shear_matrix_3, i_hat),
-            ApplyMatrix(shear_matrix_3, j_hat),
-            ApplyMatrix(shear_matrix_3, line),
+            TransformSpace(shear_matrix_3, grid, i_hat, j_hat, line),
         )
         self.wait(WAIT_TIME)
 
@@ -361,16 +355,11 @@ class PropertiesOfLinearTransformations(MovingCameraScene):
                           skip_animations=False)
 
         # Apply a non-linear transformation and show lines no longer remain straight
-        self.play(grid.animate.apply_function(
-            lambda p: p + np.array([0.1 * p[1] ** 2, 0, 0])),
-            i_hat.animate.apply_function(
-                lambda p: p + np.array([0.1 * p[1] ** 2, 0, 0])),
-            j_hat.animate.apply_function(
-                lambda p: p + np.array([0.1 * p[1] ** 2, 0, 0])),
-            line.animate.apply_function(
-                lambda p: p + np.array([0.1 * p[1] ** 2, 0, 0])),
-            Write(warn_text)
-        )
+        def warp(points):
+            return points + 0.1 * points[:, [1]] ** 2 * RIGHT
+
+        self.play(ApplyPointsFunction(warp, grid, i_hat, j_hat, line, run_time=1),
+                  Write(warn_text))
         self.wait(WAIT_TIME)
 
         # Highlight the non-linear line
@@ -412,7 +401,7 @@ class MatrixRepresentationOfTransformations(Scene):
         self.play(FadeOut(intro_text), FadeOut(title))
 
         # Setup grid and basis vectors
-        grid = NumberPlane(
+        grid = CompactPlane(
             x_range=[-10, 10], y_range=[-10, 10],
             background_line_style={"stroke_opacity": 0.4}
         )
@@ -437,34 +426,15 @@ class MatrixRepresentationOfTransformations(Scene):
         matrix_label = MathTex(r"\text{Transformation Matrix: }").to_corner(UL)
         self.play(Write(matrix_label))
 
-        # Define individual matrix elements with colors for visual clarity
-        matrix_element_11 = MathTex(
-            str(transformation_matrix[0][0]), color=RED)
-        matrix_element_12 = MathTex(
-            str(transformation_matrix[0][1]), color=BLUE)
-        matrix_element_21 = MathTex(
-            str(transformation_matrix[1][0]), color=RED)
-        matrix_element_22 = MathTex(
-            str(transformation_matrix[1][1]), color=BLUE)
-
-        # Arrange the matrix elements in grid structure to form the matrix
-        matrix_group = VGroup(
-            MathTex("[").scale(2.0),
-            VGroup(matrix_element_11, matrix_element_21).arrange(
-                DOWN, buff=0.3),
-            VGroup(matrix_element_12, matrix_element_22).arrange(
-                DOWN, buff=0.3),
-            MathTex("]").scale(2.0),
-        ).arrange(RIGHT, buff=0.5).next_to(matrix_label, RIGHT)
+        # Matrix with its columns colored like the basis vectors they hold
+        matrix_group = ColumnMatrix(transformation_matrix).next_to(matrix_label, RIGHT)
 
         self.play(Write(matrix_group))
         self.next_section()  # Transition after showing matrix representation
 
         # Apply the matrix transformation to the grid and basis vectors
         self.play(
-            ApplyMatrix(transformation_matrix, grid),
-            ApplyMatrix(transformation_matrix, i_hat),
-            ApplyMatrix(transformation_matrix, j_hat),
+            TransformSpace(transformation_matrix, grid, i_hat, j_hat),
         )
         self.next_section()  # Transition after applying matrix transformation
 
@@ -478,34 +448,14 @@ class MatrixRepresentationOfTransformations(Scene):
 
         # Apply another matrix transformation to the grid and basis vectors
         transformation_matrix_2 = [[0, 1], [1, 0]]
-        # Define individual matrix elements with colors for visual clarity
-        t2_matrix_element_11 = MathTex(
-            str(transformation_matrix_2[0][0]), color=RED)
-        t2_matrix_element_12 = MathTex(
-            str(transformation_matrix_2[0][1]), color=BLUE)
-        t2_matrix_element_21 = MathTex(
-            str(transformation_matrix_2[1][0]), color=RED)
-        t2_matrix_element_22 = MathTex(
-            str(transformation_matrix_2[1][1]), color=BLUE)
-
-        # Arrange the matrix elements in grid structure to form the matrix
-        t2_matrix_group = VGroup(
-            MathTex("[").scale(2.0),
-            VGroup(t2_matrix_element_11, t2_matrix_element_21).arrange(
-                DOWN, buff=0.3),
-            VGroup(t2_matrix_element_12, t2_matrix_element_22).arrange(
-                DOWN, buff=0.3),
-            MathTex("]").scale(2.0),
-        ).arrange(RIGHT, buff=0.5).next_to(matrix_label, RIGHT)
+        t2_matrix_group = ColumnMatrix(transformation_matrix_2).next_to(matrix_label, RIGHT)
 
         self.play(Write(t2_matrix_group),
                   matrix_group.animate.next_to(t2_matrix_group, RIGHT))
         self.next_section()  # Transition after showing matrix representation
 
         self.play(
-            ApplyMatrix(transformation_matrix_2, grid),
-            ApplyMatrix(transformation_matrix_2, i_hat),
-            ApplyMatrix(transformation_matrix_2, j_hat),
+            TransformSpace(transformation_matrix_2, grid, i_hat, j_hat),
         )
         self.next_section()  # Transition after applying second matrix transformation
 
@@ -542,7 +492,7 @@ class MatrixRepresentationOfTransformations3D(ThreeDScene):
         )
 
         # Create a grid with smaller intervals for visual effect
-        grid = NumberPlane(
+        grid = CompactPlane(
             x_range=[-10, 10, 1],
             y_range=[-10, 10, 1],
             background_line_style={"stroke_opacity": 0.2}
@@ -594,10 +544,7 @@ class MatrixRepresentationOfTransformations3D(ThreeDScene):
 
         # Apply matrix transformation to the grid, axes, and basis vectors
         self.play(
-            ApplyMatrix(transformation_matrix_3d, grid_3d),
-            ApplyMatrix(transformation_matrix_3d, i_hat),
-            ApplyMatrix(transformation_matrix_3d, j_hat),
-            ApplyMatrix(transformation_matrix_3d, k_hat),
+            TransformSpace(transformation_matrix_3d, grid_3d, i_hat, j_hat, k_hat),
         )
         self.next_section()  # Transition after applying matrix transformation
 
@@ -0,0 +1,27 @@
+"""Rendering helpers shared by the chapter scenes."""
+
+import importlib
+
+# name -> submodule defining it; loaded on first use, so the modules that
+# don't need manim (deck.store, deck.pipeline, ...) import without it
+_EXPORTS = {
+    "CoordinateLabel": "labels",
+    "ColumnMatrix": "matrices",
+    "CompactPlane": "grid",
+    "LatticeLines": "grid",
+    "ViewportPlane": "grid",
+    "TransformSpace": "transforms",
+    "ApplyPointsFunction": "transforms",
+    "apply_points_function": "transforms",
+}
+_SUBMODULES = ("sharing", "tex_cache", "text_cache")
+
+__all__ = [*_SUBMODULES, *_EXPORTS]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
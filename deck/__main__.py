@@ -0,0 +1,75 @@
+"""Command line entry point: ``python -m deck [options] [Scene ...]``."""
+
+import argparse
+import sys
+
+from . import runner
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck",
+        description="Render the chapter scenes in parallel.",
+    )
+    parser.add_argument("scenes", nargs="*",
+                        help="only render these scene classes (default: all)")
+    parser.add_argument("-m", "--module", action="append", dest="modules",
+                        help="chapter module to scan (repeatable)")
+    parser.add_argument("-q", "--quality", default="l",
+                        choices=sorted(runner.QUALITY_FLAGS),
+                        help="render quality, as in `manim -q`")
+    parser.add_argument("--also-quality", action="append", default=[],
+                        dest="extra_qualities", choices=sorted(runner.QUALITY_FLAGS),
+                        help="also write the scenes at this quality's resolution, from "
+                             "the same run and at the -q frame rate (repeatable)")
+    parser.add_argument("--raster-threads", type=int, default=None,
+                        help="threads rasterizing the --also-quality outputs "
+                             "(default: one per output)")
+    parser.add_argument("--frame-queue", type=int, default=4, dest="frame_queue_depth",
+                        help="frames buffered between rasterizing and the encoder "
+                             "(default: 4)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="split each scene's sections across this many workers, "
+                             "then join them (default: 1)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: number of cores)")
+    parser.add_argument("--draft", action="store_true",
+                        help="only render the last frame of each section, plus a "
+                             "contact sheet per scene")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="run every play, updater, LaTeX and Text build without "
+                             "rasterizing or encoding; report section lengths and fail "
+                             "on misplaced FadeOuts/Writes")
+    parser.add_argument("--slides", action="store_true",
+                        help="also write each scene as one fragmented MP4 with a JSON "
+                             "index of its sections")
+    parser.add_argument("--no-tex-batch", action="store_false", dest="tex_batch",
+                        help="do not compile the deck's LaTeX up front in one document")
+    parser.add_argument("--profile", action="store_true",
+                        help="time LaTeX, text, animation, updaters, rasterizing and "
+                             "encoding per section (JSON reports in media/profiles)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    _, failures = runner.render_deck(
+        module_names=args.modules or runner.CHAPTER_MODULES,
+        scene_names=args.scenes,
+        quality=args.quality,
+        workers=args.workers,
+        profile=args.profile,
+        draft=args.draft,
+        slides=args.slides,
+        tex_batch_compile=args.tex_batch,
+        extra_qualities=args.extra_qualities,
+        frame_queue_depth=args.frame_queue_depth,
+        raster_threads=args.raster_threads,
+        shards=args.shards,
+        dry_run=args.dry_run,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
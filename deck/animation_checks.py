@@ -0,0 +1,62 @@
+"""Mistakes in a play that manim lets through silently (see :mod:`deck.dryrun`)."""
+
+
+def _leaf_animations(animation):
+    sub_animations = getattr(animation, "animations", None)
+    if not sub_animations:
+        yield animation
+        return
+    for sub_animation in sub_animations:
+        yield from _leaf_animations(sub_animation)
+
+
+def _introduced_by_groups(animation, top_level=True):
+    """Mobjects that ``animation``'s groups bring into the scene themselves.
+
+    The scene adds the mobject of a top-level animation that is not an
+    introducer, and an introducer group adds its own; ``Flash`` brings its
+    lines either way and then removes them again.
+    """
+    sub_animations = getattr(animation, "animations", None)
+    if not sub_animations:
+        return []
+    introduced = []
+    if animation.mobject is not None and (top_level or animation.is_introducer()):
+        introduced += animation.mobject.get_family()
+    for sub_animation in sub_animations:
+        introduced += _introduced_by_groups(sub_animation, top_level=False)
+    return introduced
+
+
+def play_problems(animations, present, play):
+    """Describe the mistakes among the ``animations`` of play number ``play``.
+
+    ``present`` holds the mobjects in the scene before the play began.
+    """
+    problems = []
+    introduced = []
+    for animation in animations:
+        introduced += _introduced_by_groups(animation)
+    for animation in animations:
+        for leaf in _leaf_animations(animation):
+            mobject = leaf.mobject
+            # deck.transforms animations introduce a helper Group and
+            # point ``mobject`` at one of their targets once begun
+            if mobject is None or hasattr(leaf, "targets"):
+                continue
+            # ShowPassingFlash and the like add what they take away
+            if leaf.is_introducer() and leaf.is_remover():
+                continue
+            in_scene = mobject in present
+            # removing what the play's own group brought in is fine
+            if leaf.is_remover() and not in_scene and mobject not in introduced:
+                problems.append(
+                    f"play {play}: {type(leaf).__name__} of "
+                    f"{type(mobject).__name__} '{mobject}', which is not in the scene"
+                )
+            elif leaf.is_introducer() and in_scene:
+                problems.append(
+                    f"play {play}: {type(leaf).__name__} of "
+                    f"{type(mobject).__name__} '{mobject}', which is already in the scene"
+                )
+    return problems
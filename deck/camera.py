@@ -0,0 +1,187 @@
+"""Faster drop-in for ThreeDCamera.
+
+``ThreeDCamera`` projects each submobject on its own when it is drawn (a
+dozen small NumPy calls per line of a grid) and depth-sorts the whole family
+list with a Python key function every frame. With the ambient camera
+rotation on, every frame redraws every mobject, so that overhead is paid
+for each of the hundreds of lines of ``grid_3d`` on every frame, and titles
+and matrices fixed in the frame are rasterized again although they look the
+same on every frame.
+"""
+
+import itertools as it
+import math
+from collections import OrderedDict
+
+import cairo
+import numpy as np
+from manim import Camera, ThreeDCamera, VMobject
+from manim.utils.hashing import KEYS_TO_FILTER_OUT
+
+from .fingerprint import mobjects_fingerprint
+
+
+def pixel_bounds(camera, mobjects, matrix):
+    """``(x0, y0, x1, y1)`` pixels covering ``mobjects`` drawn with ``matrix``.
+
+    Goes by the points as stored, so not for mobjects a 3D camera projects,
+    and leaves room for their strokes. None if they cover nothing on screen.
+    """
+    points = [mob.points for mob in mobjects if len(mob.points) > 0]
+    if not points:
+        return None
+    points = np.vstack(points)
+    if not np.all(np.isfinite(points)):
+        points = points[np.all(np.isfinite(points), axis=1)]
+        if not len(points):
+            return None
+    # bezier control points bound the curves; pad for strokes and miters
+    stroke = max(
+        max(getattr(mob, "stroke_width", 0), getattr(mob, "background_stroke_width", 0))
+        for mob in mobjects
+    )
+    pad = math.ceil(5 * stroke * camera.cairo_line_width_multiple * abs(matrix.xx)) + 2
+    xs = points[:, 0].min(), points[:, 0].max()
+    ys = points[:, 1].min(), points[:, 1].max()
+    corners = np.array([matrix.transform_point(x, y) for x in xs for y in ys])
+    x0 = max(math.floor(corners[:, 0].min()) - pad, 0)
+    y0 = max(math.floor(corners[:, 1].min()) - pad, 0)
+    x1 = min(math.ceil(corners[:, 0].max()) + pad, camera.pixel_width)
+    y1 = min(math.ceil(corners[:, 1].max()) + pad, camera.pixel_height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
+
+# manim hashes the camera's attributes into every play's hash. The layer
+# cache of ProjectedThreeDCamera is empty after skipped plays, and a play
+# must hash the same whether or not the plays before it were rendered
+KEYS_TO_FILTER_OUT.add("overlays")
+
+
+class ProjectedThreeDCamera(ThreeDCamera):
+    """Projects the points of every displayed VMobject with one matrix
+    multiply per frame, and only depth-sorts mobjects with ``shade_in_3d``
+    (which are the only ones ``ThreeDCamera`` orders by depth anyway).
+    Lines, planes and text keep their family order without being sorted.
+
+    Each run of consecutive fixed-in-frame mobjects is rasterized once into
+    an RGBA layer covering their bounding box and composited on later
+    frames. Layers are keyed by the drawn state of the run (points, colours,
+    opacities, stroke widths), so any change to those draws a new layer.
+    """
+
+    overlay_cache_size = 8
+
+    def __init__(self, *args, **kwargs):
+        self.projected = {}
+        self.overlays = OrderedDict()
+        super().__init__(*args, **kwargs)
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        self.reset_rotation_matrix()
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        self.project_mobjects(mobjects)
+        try:
+            for fixed, run in it.groupby(mobjects, lambda mob: mob in self.fixed_in_frame_mobjects):
+                run = list(run)
+                if fixed and self.composite_overlay(run):
+                    continue
+                # as Camera.capture_mobjects
+                for group_type, group in it.groupby(run, self.type_or_raise):
+                    self.display_funcs[group_type](list(group), self.pixel_array)
+        finally:
+            self.projected = {}
+
+    def composite_overlay(self, mobjects):
+        """Draw ``mobjects`` from a cached layer; False if they can't be cached."""
+        if not all(isinstance(mob, VMobject) and mob.get_background_image() is None
+                   for mob in mobjects):
+            return False
+        fingerprint = mobjects_fingerprint(mobjects, include_submobjects=False)
+        if fingerprint is None:
+            return False
+        ctx = self.get_cairo_context(self.pixel_array)
+        matrix = ctx.get_matrix()
+        key = (fingerprint, matrix.xx, matrix.yy, matrix.x0, matrix.y0)
+        if key in self.overlays:
+            self.overlays.move_to_end(key)
+        else:
+            self.overlays[key] = self.rasterize_overlay(mobjects, matrix)
+            if len(self.overlays) > self.overlay_cache_size:
+                self.overlays.popitem(last=False)
+        overlay = self.overlays[key]
+        if overlay is None:
+            # nothing visible
+            return True
+        x0, y0, surface, _ = overlay
+        ctx.save()
+        ctx.identity_matrix()
+        ctx.rectangle(x0, y0, surface.get_width(), surface.get_height())
+        ctx.clip()
+        ctx.set_source_surface(surface, x0, y0)
+        ctx.paint()
+        ctx.restore()
+        return True
+
+    def rasterize_overlay(self, mobjects, matrix):
+        bounds = pixel_bounds(self, mobjects, matrix)
+        if bounds is None:
+            return None
+        x0, y0, x1, y1 = bounds
+
+        layer = np.zeros((y1 - y0, x1 - x0, 4), dtype=self.pixel_array_dtype)
+        surface = cairo.ImageSurface.create_for_data(
+            layer, cairo.FORMAT_ARGB32, x1 - x0, y1 - y0
+        )
+        ctx = cairo.Context(surface)
+        ctx.set_matrix(cairo.Matrix(
+            matrix.xx, matrix.yx, matrix.xy, matrix.yy, matrix.x0 - x0, matrix.y0 - y0
+        ))
+        # the display methods look the context up by pixel array
+        self.cache_cairo_context(layer, ctx)
+        try:
+            self.display_multiple_non_background_colored_vmobjects(mobjects, layer)
+        finally:
+            del self.pixel_array_to_cairo_context[id(layer)]
+        surface.flush()
+        return x0, y0, surface, layer
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = Camera.get_mobjects_to_display(self, *args, **kwargs)
+        shaded = [i for i, mob in enumerate(mobjects) if getattr(mob, "shade_in_3d", False)]
+        if not shaded:
+            return mobjects
+        # same order as ThreeDCamera's stable sort: unshaded mobjects last
+        # (depth inf), shaded ones by the depth of their reference point
+        depths = np.full(len(mobjects), np.inf)
+        references = np.array([mobjects[i].get_z_index_reference_point() for i in shaded])
+        depths[shaded] = references @ self.get_rotation_matrix()[2]
+        return [mobjects[i] for i in np.argsort(depths, kind="stable")]
+
+    def project_mobjects(self, mobjects):
+        batch = [
+            mob for mob in mobjects
+            if isinstance(mob, VMobject)
+            and mob not in self.fixed_in_frame_mobjects
+            and mob not in self.fixed_orientation_mobjects
+            and len(mob.points) > 0
+        ]
+        arrays = [mob.points for mob in batch]
+        finite = [np.all(np.isfinite(points)) for points in arrays]
+        # mobjects with invalid points go through transform_points_pre_display
+        batch = [mob for mob, ok in zip(batch, finite) if ok]
+        arrays = [points for points, ok in zip(arrays, finite) if ok]
+        if not arrays:
+            return
+        projected = self.project_points(np.vstack(arrays))
+        ends = np.cumsum([len(points) for points in arrays])
+        for mob, points, end in zip(batch, arrays, ends):
+            self.projected[id(mob)] = (points, projected[end - len(points):end])
+
+    def transform_points_pre_display(self, mobject, points):
+        cached = self.projected.get(id(mobject))
+        # only the outline itself was projected, not e.g. gradient end points
+        if cached is not None and cached[0] is points:
+            return cached[1]
+        return super().transform_points_pre_display(mobject, points)
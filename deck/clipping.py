@@ -0,0 +1,27 @@
+"""Clipping of many straight segments to a rectangle at once."""
+
+import numpy as np
+
+
+def clip_segments(starts, ends, viewport):
+    """Liang-Barsky clipping of the segments ``starts[i] -> ends[i]``.
+
+    ``viewport`` is ``(x_min, x_max, y_min, y_max)``; only the first two
+    columns of the points are looked at. Returns ``(keep, t0, t1)``: whether
+    each segment crosses the viewport, and the fractions along it where the
+    part inside starts and ends.
+    """
+    x_min, x_max, y_min, y_max = viewport
+    starts = np.asarray(starts, dtype=float)
+    delta = np.asarray(ends, dtype=float) - starts
+    p = np.stack([-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]], axis=1)
+    q = np.stack([
+        starts[:, 0] - x_min, x_max - starts[:, 0],
+        starts[:, 1] - y_min, y_max - starts[:, 1],
+    ], axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = q / p
+    t0 = np.max(np.where(p < 0, ratio, 0), axis=1)
+    t1 = np.min(np.where(p > 0, ratio, 1), axis=1)
+    outside = np.any((p == 0) & (q < 0), axis=1)
+    return ~outside & (t0 <= t1), t0, t1
@@ -0,0 +1,224 @@
+"""Warm render server: ``python -m deck.daemon serve``, then ``render Scene ...``.
+
+Every ``python -m deck`` or ``manim`` call imports manim, parses its config
+and starts with empty in-memory caches before the first frame. The server
+does that once and then renders scenes of the chapter modules on request,
+one at a time, in its own process, so ManimPango's fonts, the parsed
+LaTeX and Text SVGs (manim's ``SVG_HASH_TO_MOB_MAP``,
+:mod:`deck.text_cache`) and the imported chapter modules stay loaded
+between renders. A chapter module whose file changed since it was
+imported is reloaded before the render; the others are left alone.
+
+Requests and replies are one JSON object per line on a Unix socket
+(``DECK_DAEMON_SOCKET``, by default in the cache dir)::
+
+    {"scenes": ["IntroToLinearTransformation"], "quality": "l", "draft": false}
+    {"rendered": [{"scene": "chapter2.IntroToLinearTransformation", "seconds": 1.9,
+                   "outputs": ["media/videos/chapter2/480p15/IntroToLinearTransformation.mp4",
+                               ...]}],
+     "failures": {}}
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from . import dryrun, runner
+from .store import DEFAULT_CACHE_DIR
+
+SOCKET_PATH = Path(os.environ.get("DECK_DAEMON_SOCKET", DEFAULT_CACHE_DIR / "render.sock"))
+
+# runner.run_scene options a request may set
+RENDER_OPTIONS = (
+    "quality", "extra_config", "profile", "draft", "slides", "extra_qualities",
+    "frame_queue_depth", "raster_threads", "dry_run",
+)
+
+
+def scene_outputs(scene):
+    """The files and directories a render of ``scene`` wrote."""
+    renderer = scene.renderer
+    writers = [renderer.file_writer]
+    # deck.resolutions
+    writers += [output.file_writer for output in getattr(renderer, "outputs", ())]
+    paths = []
+    for writer in writers:
+        for name in ("movie_file_path", "sections_output_dir"):
+            path = getattr(writer, name, None)
+            if path is not None and Path(path).exists():
+                paths.append(str(path))
+    # deck.dryrun
+    if isinstance(renderer, dryrun.DryRunRenderer):
+        paths.append(str(dryrun.report_path(
+            f"{type(scene).__module__}.{type(scene).__name__}"
+        )))
+    # deck.draft
+    draft_dir = getattr(renderer, "draft_dir", None)
+    if draft_dir is not None:
+        paths.append(str(draft_dir))
+    return paths
+
+
+class RenderServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path=SOCKET_PATH, module_names=runner.CHAPTER_MODULES):
+        self.module_names = list(module_names)
+        # module name -> mtime of its file when it was imported
+        self.imported = {}
+        self.refresh_modules()
+        socket_path = Path(socket_path)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # left behind by a server that did not shut down cleanly
+        socket_path.unlink(missing_ok=True)
+        self.socket_path = socket_path
+        super().__init__(str(socket_path), RequestHandler)
+
+    def refresh_modules(self):
+        """Import the chapter modules, reloading those whose file changed."""
+        for module_name in self.module_names:
+            module = sys.modules.get(module_name)
+            if module is None:
+                module = importlib.import_module(module_name)
+            elif os.path.getmtime(module.__file__) != self.imported.get(module_name):
+                module = importlib.reload(module)
+                print(f"Reloaded {module_name}")
+            self.imported[module_name] = os.path.getmtime(module.__file__)
+
+    def render(self, request):
+        self.refresh_modules()
+        scene_names = request.get("scenes") or []
+        scenes = runner.discover_scenes(self.module_names)
+        known = {scene_name for _, scene_name in scenes}
+        options = {name: request[name] for name in RENDER_OPTIONS if name in request}
+        rendered = []
+        failures = {name: "unknown scene" for name in scene_names if name not in known}
+        for module_name, scene_name in scenes:
+            if scene_names and scene_name not in scene_names:
+                continue
+            key = f"{module_name}.{scene_name}"
+            start = time.perf_counter()
+            try:
+                scene = runner.run_scene(module_name, scene_name, **options)
+            except Exception as e:
+                traceback.print_exc()
+                failures[key] = repr(e)
+                continue
+            rendered.append({
+                "scene": key,
+                "seconds": time.perf_counter() - start,
+                "outputs": scene_outputs(scene),
+            })
+        return {"rendered": rendered, "failures": failures}
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                self.reply({"error": f"invalid request: {e}"})
+                continue
+            if request.get("command") == "shutdown":
+                self.reply({"shutdown": True})
+                # shutdown() waits for serve_forever, which is running us
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            self.reply(self.server.render(request))
+
+    def reply(self, message):
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+
+def send(request, socket_path=SOCKET_PATH):
+    """Send one request to a running server and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m deck.daemon",
+        description="Keep manim and the deck's caches loaded between renders.",
+    )
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH,
+                        help=f"Unix socket of the server (default: {SOCKET_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="start the server in the foreground")
+    serve.add_argument("-m", "--module", action="append", dest="modules",
+                       help="chapter module to serve (repeatable)")
+
+    render = commands.add_parser("render", help="render scenes on the running server")
+    render.add_argument("scenes", nargs="+", help="scene classes to render")
+    render.add_argument("-q", "--quality", default="l", choices=sorted(runner.QUALITY_FLAGS),
+                        help="render quality, as in `manim -q`")
+    render.add_argument("--draft", action="store_true",
+                        help="only render the last frame of each section")
+    render.add_argument("--dry-run", action="store_true",
+                        help="run the scenes without rasterizing or encoding")
+    render.add_argument("--slides", action="store_true",
+                        help="also write each scene as one fragmented MP4")
+    render.add_argument("--profile", action="store_true",
+                        help="save a per-section timing report")
+
+    commands.add_parser("stop", help="shut the running server down")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "serve":
+        with RenderServer(args.socket, args.modules or runner.CHAPTER_MODULES) as server:
+            print(f"Serving renders on {args.socket}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    if args.command == "stop":
+        request = {"command": "shutdown"}
+    else:
+        request = {
+            "scenes": args.scenes,
+            "quality": args.quality,
+            "draft": args.draft,
+            "dry_run": args.dry_run,
+            "slides": args.slides,
+            "profile": args.profile,
+        }
+    try:
+        reply = send(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No render server on {args.socket}; start one with `python -m deck.daemon serve`")
+        return 1
+    for entry in reply.get("rendered", ()):
+        print(f"{entry['scene']}  {entry['seconds']:.2f}s")
+        for path in entry["outputs"]:
+            print(f"  {path}")
+    for key, error in reply.get("failures", {}).items():
+        print(f"{key}  FAILED  {error}")
+    if "error" in reply:
+        print(reply["error"])
+    return 1 if reply.get("failures") or "error" in reply else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
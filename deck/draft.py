@@ -0,0 +1,107 @@
+"""Draft renders: the last frame of every section, nothing in between.
+
+:class:`DraftRenderer` plays the scene with animations skipped, so each
+``play`` jumps straight to its end state, and rasterizes only when a section
+ends. The result is one PNG per section and a contact sheet per scene in
+``<images_dir>/<Scene>/draft``; no movie is written.
+"""
+
+import re
+from pathlib import Path
+
+from manim import config
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.iterables import list_update
+from PIL import Image, ImageDraw
+
+# config for draft renders, on top of runner.scene_config
+DRAFT_CONFIG = {
+    "write_to_movie": False,
+    "save_sections": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+}
+
+THUMBNAIL_WIDTH = 480
+SHEET_COLUMNS = 4
+LABEL_HEIGHT = 24
+
+
+class DraftFileWriter(SceneFileWriter):
+    def next_section(self, name, type, skip_animations):
+        # SceneFileWriter.__init__ opens the first section before there is
+        # anything to draw
+        if self.sections:
+            self.renderer.capture_section(self.sections[-1])
+        super().next_section(name, type, skip_animations)
+
+
+class DraftRenderer(CairoRenderer):
+    def __init__(self, file_writer_class=DraftFileWriter, skip_animations=True, **kwargs):
+        super().__init__(
+            file_writer_class=file_writer_class, skip_animations=skip_animations, **kwargs
+        )
+        self.scene = None
+        self.thumbnails = []
+        self._plays_at_section_start = 0
+
+    def init_scene(self, scene):
+        self.scene = scene
+        super().init_scene(scene)
+        self.draft_dir = Path(config.get_dir("images_dir")) / type(scene).__name__ / "draft"
+        self.draft_dir.mkdir(parents=True, exist_ok=True)
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True,
+                     ignore_skipping=True, **kwargs):
+        # only capture_section rasterizes
+        pass
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+        return None
+
+    def render(self, scene, time, moving_mobjects):
+        pass
+
+    def freeze_current_frame(self, duration):
+        pass
+
+    def capture_section(self, section):
+        played = self.num_plays > self._plays_at_section_start
+        self._plays_at_section_start = self.num_plays
+        if not played:
+            return
+        # Scene.play_internal skips its final updater pass when skipping
+        self.scene.update_mobjects(0)
+        self.camera.reset()
+        self.camera.capture_mobjects(
+            list_update(self.scene.mobjects, self.scene.foreground_mobjects)
+        )
+        image = self.camera.get_image()
+        slug = re.sub(r"[^\w-]+", "_", section.name).strip("_")
+        path = self.draft_dir / f"{len(self.thumbnails):03}_{slug}.png"
+        image.save(path)
+        self.thumbnails.append((section.name, path))
+
+    def scene_finished(self, scene):
+        self.capture_section(self.file_writer.sections[-1])
+        if self.thumbnails:
+            contact_sheet(self.thumbnails, self.draft_dir / f"{type(scene).__name__}_sheet.png")
+
+
+def contact_sheet(thumbnails, path, columns=SHEET_COLUMNS, width=THUMBNAIL_WIDTH):
+    """Tile ``(label, png_path)`` pairs into one captioned image."""
+    images = [Image.open(png).convert("RGB") for _, png in thumbnails]
+    height = round(width * images[0].height / images[0].width)
+    columns = min(columns, len(images))
+    rows = -(-len(images) // columns)
+    sheet = Image.new("RGB", (columns * width, rows * (height + LABEL_HEIGHT)), "black")
+    draw = ImageDraw.Draw(sheet)
+    for index, ((label, _), image) in enumerate(zip(thumbnails, images)):
+        x = (index % columns) * width
+        y = (index // columns) * (height + LABEL_HEIGHT)
+        sheet.paste(image.resize((width, height)), (x, y))
+        draw.text((x + 6, y + height + 4), f"{index}. {label}", fill="white")
+    sheet.save(path)
+    return path
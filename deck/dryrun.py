@@ -0,0 +1,160 @@
+"""Dry runs: every play, wait and updater of a scene, nothing rasterized.
+
+:class:`DryRunRenderer` steps through each play frame by frame like a real
+render, so updaters, value trackers and the LaTeX and Text built along the
+way all run, but it never draws a frame or starts ffmpeg. For every
+section it records the seconds of video the section would last, the
+number of plays, frames and mobjects, and any mistakes spotted in its
+plays:
+
+* a remover (``FadeOut``, ``Uncreate``, ...) of a mobject that is not in
+  the scene, which manim silently adds just to take it away again;
+* an introducer (``Write``, ``Create``, ``FadeIn``, ...) of a mobject that
+  is already in the scene.
+
+Animations that bring in their own mobjects and take them away again, such
+as ``Flash`` and ``ShowPassingFlash``, are not mistakes and are left alone.
+
+The report is saved as JSON in ``DECK_DRY_RUN_DIR`` (``media/dry_runs``).
+"""
+
+import json
+import os
+from pathlib import Path
+
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from .animation_checks import play_problems
+
+# config for dry runs, on top of runner.scene_config
+DRY_RUN_CONFIG = {
+    "write_to_movie": False,
+    "save_sections": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+}
+
+DRY_RUN_DIR = Path(os.environ.get("DECK_DRY_RUN_DIR", "media/dry_runs"))
+
+
+class DryRunError(Exception):
+    """A dry run found mistakes in a scene's plays."""
+
+
+class DryRunFileWriter(SceneFileWriter):
+    def next_section(self, name, type, skip_animations):
+        self.renderer.start_section(name)
+        super().next_section(name, type, skip_animations)
+
+
+class DryRunRenderer(CairoRenderer):
+    def __init__(self, file_writer_class=DryRunFileWriter, **kwargs):
+        self.sections = []
+        self.scene = None
+        self._present = []
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+
+    def init_scene(self, scene):
+        self.scene = scene
+        super().init_scene(scene)
+
+    def start_section(self, name):
+        if self.sections:
+            self.finish_section()
+        self.sections.append({
+            "name": name, "start": self.time, "seconds": 0.0,
+            "plays": 0, "frames": 0, "mobjects": 0, "problems": [],
+        })
+
+    def finish_section(self):
+        section = self.sections[-1]
+        section["seconds"] = self.time - section["start"]
+        if self.scene is not None:
+            section["mobjects"] = len(self.scene.get_mobject_family_members())
+
+    def play(self, scene, *args, **kwargs):
+        # what is on screen before the play adds its mobjects
+        self._present = scene.get_mobject_family_members()
+        self.sections[-1]["plays"] += 1
+        super().play(scene, *args, **kwargs)
+
+    def check_animations(self, scene):
+        self.sections[-1]["problems"] += play_problems(
+            scene.animations, self._present, self.num_plays
+        )
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True,
+                     ignore_skipping=True, **kwargs):
+        pass
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        # called once the play's animations have begun
+        self.check_animations(scene)
+        self.static_image = None
+        return None
+
+    def render(self, scene, time, moving_mobjects):
+        self.add_frame(None)
+
+    def freeze_current_frame(self, duration):
+        dt = 1 / self.camera.frame_rate
+        self.add_frame(None, num_frames=int(duration / dt))
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations:
+            return
+        self.time += num_frames / self.camera.frame_rate
+        self.sections[-1]["frames"] += num_frames
+
+    def scene_finished(self, scene):
+        self.finish_section()
+        super().scene_finished(scene)
+
+    def report(self):
+        sections = [
+            {key: value for key, value in section.items() if key != "start"}
+            for section in self.sections
+            # SceneFileWriter.__init__ opens a first section that is left
+            # empty when the scene starts with next_section
+            if section["plays"] or section is self.sections[-1]
+        ]
+        return {
+            "scene": type(self.scene).__name__,
+            "seconds": self.time,
+            "plays": self.num_plays,
+            "frames": sum(section["frames"] for section in sections),
+            "problems": sum(len(section["problems"]) for section in sections),
+            "sections": sections,
+        }
+
+
+def report_path(scene_key):
+    return DRY_RUN_DIR / f"{scene_key}.json"
+
+
+def save_report(scene_key, report):
+    path = report_path(scene_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=4))
+    return path
+
+
+def load_report(scene_key):
+    return json.loads(report_path(scene_key).read_text())
+
+
+def print_report(report):
+    width = max([len(section["name"]) for section in report["sections"]] + [7])
+    header = f"{'Section':<{width}}  {'Seconds':>7}  {'Plays':>5}  {'Frames':>6}  {'Mobjects':>8}"
+    print(f"\n{report['scene']}")
+    print(header)
+    print("-" * len(header))
+    for section in report["sections"]:
+        print(f"{section['name']:<{width}}  {section['seconds']:>7.2f}  {section['plays']:>5}"
+              f"  {section['frames']:>6}  {section['mobjects']:>8}")
+        for problem in section["problems"]:
+            print(f"  ! {problem}")
+    print("-" * len(header))
+    print(f"{'Total':<{width}}  {report['seconds']:>7.2f}  {report['plays']:>5}"
+          f"  {report['frames']:>6}")
@@ -0,0 +1,42 @@
+"""One SVG per page of a LaTeX document, from a single dvisvgm run."""
+
+import subprocess
+from pathlib import Path
+
+
+def convert_pages(document, output_dir, pdf=False):
+    """Write every page of ``document`` (DVI, or PDF with ``pdf``) as
+    ``page-<n>.svg`` in ``output_dir`` and return them in page order."""
+    output_dir = Path(output_dir)
+    subprocess.run(
+        [
+            "dvisvgm",
+            *(["--pdf"] if pdf else []),
+            "--page=1-",
+            "--no-fonts",
+            "--verbosity=0",
+            f"--output={(output_dir / 'page-%p.svg').as_posix()}",
+            Path(document).as_posix(),
+        ],
+        check=False,
+    )
+    return page_files(output_dir)
+
+
+def page_files(output_dir):
+    # by number, so page-10 comes after page-9
+    return sorted(
+        Path(output_dir).glob("page-*.svg"), key=lambda path: int(path.stem.rsplit("-", 1)[1])
+    )
+
+
+def assign_pages(items, pages):
+    """Pair the ``items`` typeset as the pages of a document with ``pages``.
+
+    Raises ValueError when there are not exactly as many pages as items,
+    as when a formula spilled onto a second page.
+    """
+    items = list(items)
+    if len(pages) != len(items):
+        raise ValueError(f"got {len(pages)} pages for {len(items)} expressions")
+    return list(zip(items, pages))
@@ -0,0 +1,68 @@
+"""Cheap digests of what the camera would draw, to skip redrawing it."""
+
+import hashlib
+
+import numpy as np
+from manim import VMobject
+
+# everything Camera.display_vectorized reads from a VMobject
+DRAWN_ATTRIBUTES = (
+    "points",
+    "fill_rgbas",
+    "stroke_rgbas",
+    "background_stroke_rgbas",
+    "stroke_width",
+    "background_stroke_width",
+    "sheen_factor",
+    "sheen_direction",
+    "z_index",
+    "shade_in_3d",
+    "joint_type",
+    "cap_style",
+)
+
+
+def update_digest(digest, mobjects, include_submobjects=True):
+    """Feed the drawn state of ``mobjects`` to ``digest``.
+
+    Returns False when some mobject with points is not a VMobject, as there
+    is no cheap way to tell whether those changed.
+    """
+    for mobject in mobjects:
+        for submob in mobject.get_family() if include_submobjects else [mobject]:
+            if not isinstance(submob, VMobject):
+                if submob.has_points():
+                    return False
+                # a Group only holds its submobjects, which are seen next
+                digest.update(id(submob).to_bytes(8, "little"))
+                continue
+            digest.update(id(submob).to_bytes(8, "little"))
+            for name in DRAWN_ATTRIBUTES:
+                value = getattr(submob, name, None)
+                if isinstance(value, np.ndarray):
+                    digest.update(value.tobytes())
+                else:
+                    digest.update(repr(value).encode())
+    return True
+
+
+def mobjects_fingerprint(mobjects, include_submobjects=True):
+    digest = hashlib.blake2b(digest_size=16)
+    if not update_digest(digest, mobjects, include_submobjects):
+        return None
+    return digest.digest()
+
+
+def frame_fingerprint(camera, mobjects):
+    """Digest of what ``camera`` would draw for ``mobjects``, or None."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (camera.frame_center, camera.frame_width, camera.frame_height):
+        digest.update(np.asarray(value, dtype=float).tobytes())
+    if hasattr(camera, "get_value_trackers"):
+        # ThreeDCamera: orientation, zoom and where the light comes from
+        digest.update(np.array([t.get_value() for t in camera.get_value_trackers()]).tobytes())
+        digest.update(camera.light_source.points.tobytes())
+        digest.update(repr(sorted(map(id, camera.fixed_in_frame_mobjects))).encode())
+    if not update_digest(digest, mobjects):
+        return None
+    return digest.digest()
@@ -0,0 +1,32 @@
+"""Splitting a bracketed matrix typeset as one formula back into its parts."""
+
+
+def matrix_source(columns):
+    """LaTeX of ``[`` every entry of ``columns``, column by column, ``]``."""
+    return r"[\quad " + r"\quad ".join(
+        entry for column in columns for entry in column
+    ) + r"\quad ]"
+
+
+def split_glyphs(glyphs, columns):
+    """Split the glyphs of :func:`matrix_source` into its parts.
+
+    ``columns`` holds the entries as strings, one glyph per character.
+    Returns ``(left_bracket, cells, right_bracket)`` with ``cells[i][j]``
+    the list of glyphs of entry ``j`` of column ``i``.
+    """
+    glyphs = list(glyphs)
+    expected = 2 + sum(len(entry) for column in columns for entry in column)
+    if len(glyphs) != expected:
+        raise ValueError(
+            f"ColumnMatrix expected {expected} glyphs for {matrix_source(columns)!r}, got {len(glyphs)}"
+        )
+    left_bracket = glyphs.pop(0)
+    right_bracket = glyphs.pop()
+    cells = []
+    for column in columns:
+        cells.append([])
+        for entry in column:
+            cells[-1].append(glyphs[:len(entry)])
+            del glyphs[:len(entry)]
+    return left_bracket, cells, right_bracket
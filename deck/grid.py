@@ -0,0 +1,411 @@
+"""Number planes that cost less than one mobject per grid line.
+
+A ``NumberPlane(x_range=[-30, 30], ...)`` keeps every grid line as its own
+mobject, and all of them are transformed and rasterized every frame although
+the frame shows a small part of the plane. :class:`ViewportPlane` instead
+stores where the plane's origin and unit vectors currently are and
+regenerates the visible part of each line from that whenever ``points`` is
+read. Affine transforms (``ApplyMatrix``, shifts, the straight-path
+interpolation of ``Transform``) only move those three points, so a sheared
+line that enters the frame from far away is drawn exactly as the full plane
+would draw it.
+
+Planes that are warped by non-linear functions need every line.
+:class:`CompactPlane` builds them all, but keeps the plane as one array of
+segments with a style index per line, and draws each style as a single
+VMobject whose curves are the lines. Copying, transforming and drawing it
+then costs a few NumPy arrays instead of a few hundred mobjects.
+
+Copies of either plane share the arrays of the original until one of them
+is moved (see :mod:`deck.sharing`), so ghost grids cost their colours only.
+"""
+
+import numbers
+
+import numpy as np
+from manim import BLUE_D, UP, RIGHT, ORIGIN, WHITE, VGroup, VMobject, config
+from manim.utils.paths import straight_path
+
+from .clipping import clip_segments
+from .sharing import share_arrays, share_points
+
+# points of the three degenerate curves holding origin, origin + e1, origin + e2
+BASIS_POINTS = 12
+
+
+def _line_offsets(range_min, range_max, step):
+    # same offsets NumberPlane._get_lines_parallel_to_axis produces
+    return np.concatenate([
+        [0],
+        np.arange(step, min(range_max - range_min, range_max), step),
+        np.arange(-step, max(range_min - range_max, range_min), -step),
+    ])
+
+
+class LatticeLines(VMobject):
+    """Straight segments given in plane coordinates, clipped to the camera frame.
+
+    ``frame`` is the camera frame to follow (``self.camera.frame`` in a
+    MovingCameraScene); without it the static config frame is used.
+    ``margin`` extends the clipping rectangle by that fraction of the frame.
+    """
+
+    def __init__(self, segment_starts, segment_ends, frame=None, margin=0.1, **kwargs):
+        self.segment_starts = np.asarray(segment_starts, dtype=float).reshape(-1, 2)
+        self.segment_ends = np.asarray(segment_ends, dtype=float).reshape(-1, 2)
+        self.frame = frame
+        self.margin = margin
+        self._basis = np.array([ORIGIN, RIGHT, UP], dtype=float)
+        self._points = np.zeros((0, 3))
+        self._uv = np.zeros((0, 2))
+        self._cache_key = None
+        super().__init__(**kwargs)
+
+    @property
+    def points(self):
+        key = (self._basis.tobytes(), self._viewport())
+        if key != self._cache_key:
+            self._generate(key[1])
+            self._cache_key = key
+        # in-place edits by manim (handle rescaling, smoothing) must not leak
+        # into the cache; geometry only changes through the setter
+        return self._points.copy()
+
+    @points.setter
+    def points(self, new_points):
+        new_points = np.asarray(new_points, dtype=float)
+        if len(new_points) == 0:
+            # reset_points() during construction
+            return
+        if new_points.shape != self._points.shape:
+            raise ValueError(
+                f"{type(self).__name__} points can only be transformed, not replaced"
+            )
+        basis = new_points[[0, 4, 8]]
+        expected = self._map(self._uv, basis)
+        anchors = np.zeros(len(new_points), dtype=bool)
+        anchors[0::4] = anchors[3::4] = True
+        tolerance = 1e-6 * max(1.0, np.abs(new_points).max())
+        if np.abs(expected[anchors] - new_points[anchors]).max() > tolerance:
+            raise ValueError(
+                f"{type(self).__name__} only supports affine transformations; "
+                "use CompactPlane for non-linear warps"
+            )
+        self._basis = basis
+        self._cache_key = None
+
+    def __deepcopy__(self, clone_from_id):
+        # copies (ghost grids, animation targets) follow the same camera
+        if self.frame is not None:
+            clone_from_id.setdefault(id(self.frame), self.frame)
+        # only ever replaced, never written into, so copies can share them
+        share_arrays(
+            clone_from_id, self.segment_starts, self.segment_ends, self._points, self._uv
+        )
+        return super().__deepcopy__(clone_from_id)
+
+    def _viewport(self):
+        if self.frame is None:
+            center, width, height = ORIGIN, config.frame_width, config.frame_height
+        else:
+            center, width, height = self.frame.get_center(), self.frame.width, self.frame.height
+        margin = self.margin * max(width, height)
+        return (
+            round(center[0] - width / 2 - margin, 6),
+            round(center[0] + width / 2 + margin, 6),
+            round(center[1] - height / 2 - margin, 6),
+            round(center[1] + height / 2 + margin, 6),
+        )
+
+    @staticmethod
+    def _map(uv, basis):
+        origin, e1, e2 = basis
+        return origin + uv[:, 0:1] * (e1 - origin) + uv[:, 1:2] * (e2 - origin)
+
+    def _generate(self, viewport):
+        starts = self._map(self.segment_starts, self._basis)
+        ends = self._map(self.segment_ends, self._basis)
+        keep, t0, t1 = clip_segments(starts, ends, viewport)
+
+        uv_starts = self.segment_starts[keep]
+        uv_delta = self.segment_ends[keep] - uv_starts
+        # four bezier points per straight segment
+        fractions = np.array([0, 1 / 3, 2 / 3, 1])
+        t = t0[keep, None] + fractions * (t1[keep] - t0[keep])[:, None]
+        segment_uv = uv_starts[:, None, :] + t[:, :, None] * uv_delta[:, None, :]
+
+        basis_uv = np.repeat([[0, 0], [1, 0], [0, 1]], 4, axis=0)
+        self._uv = np.vstack([basis_uv, segment_uv.reshape(-1, 2)])
+        self._points = self._map(self._uv, self._basis)
+
+    def extent_corners(self):
+        """The corners of the whole (unclipped) set of segments."""
+        uv = np.vstack([self.segment_starts, self.segment_ends])
+        (u_min, v_min), (u_max, v_max) = uv.min(axis=0), uv.max(axis=0)
+        corners = np.array([[u_min, v_min], [u_max, v_min], [u_max, v_max], [u_min, v_max]])
+        return self._map(corners, self._basis)
+
+    def get_points_defining_boundary(self):
+        return self.extent_corners()
+
+    def coords_to_point(self, *coords):
+        return self._map(np.array([coords[:2]], dtype=float), self._basis)[0]
+
+    def interpolate(self, mobject1, mobject2, alpha, path_func=straight_path()):
+        # the straight path between two affine images of the lattice is the
+        # lattice under the blended map, so interpolate the basis only
+        self._basis = path_func(mobject1._basis, mobject2._basis, alpha)
+        self._cache_key = None
+        self.interpolate_color(mobject1, mobject2, alpha)
+        return self
+
+    def align_points(self, mobject):
+        return self
+
+    def null_point_align(self, mobject):
+        return self
+
+    def scale_handle_to_anchor_distances(self, factor):
+        return self
+
+
+class ViewportPlane(VGroup):
+    """Drop-in for ``NumberPlane`` (unit spacing, ranges containing 0) that
+    only builds the lines visible in ``frame``.
+
+    Supports every affine transform; non-linear ``apply_function`` warps
+    raise, since the lines outside the frame are never built.
+    """
+
+    def __init__(
+        self,
+        x_range=(-config["frame_x_radius"], config["frame_x_radius"], 1),
+        y_range=(-config["frame_y_radius"], config["frame_y_radius"], 1),
+        background_line_style=None,
+        axis_config=None,
+        frame=None,
+        margin=0.1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        x_min, x_max, x_step = (list(x_range) + [1])[:3]
+        y_min, y_max, y_step = (list(y_range) + [1])[:3]
+        if not (x_min <= 0 <= x_max and y_min <= 0 <= y_max):
+            raise ValueError("ViewportPlane ranges must contain 0")
+
+        self.background_line_style = {
+            "stroke_color": BLUE_D,
+            "stroke_width": 2,
+            "stroke_opacity": 1,
+        }
+        self.background_line_style.update(background_line_style or {})
+        self.axis_config = {"stroke_color": WHITE, "stroke_width": 2, "stroke_opacity": 1}
+        self.axis_config.update(axis_config or {})
+
+        # lines parallel to the x axis first, then to the y axis, like NumberPlane
+        ys = _line_offsets(y_min, y_max, y_step)
+        xs = _line_offsets(x_min, x_max, x_step)
+        starts = [(x_min, y) for y in ys] + [(x, y_min) for x in xs]
+        ends = [(x_max, y) for y in ys] + [(x, y_max) for x in xs]
+        self.background_lines = LatticeLines(
+            starts, ends, frame=frame, margin=margin
+        ).set_style(**self.background_line_style)
+        self.axes = LatticeLines(
+            [(x_min, 0), (0, y_min)], [(x_max, 0), (0, y_max)], frame=frame, margin=margin
+        ).set_style(**self.axis_config)
+        self.add(self.background_lines, self.axes)
+
+        # centred on the middle of the ranges, like Axes
+        self.shift(-np.array([(x_min + x_max) / 2, (y_min + y_max) / 2, 0]))
+
+    def get_points_defining_boundary(self):
+        return np.vstack([
+            submob.get_points_defining_boundary()
+            if isinstance(submob, LatticeLines)
+            else submob.get_anchors()
+            for submob in self.get_family()
+            if submob.has_points()
+        ])
+
+    def coords_to_point(self, *coords):
+        return self.background_lines.coords_to_point(*coords)
+
+    def c2p(self, *coords):
+        return self.coords_to_point(*coords)
+
+    def get_origin(self):
+        return self.coords_to_point(0, 0)
+
+    def scale_handle_to_anchor_distances(self, factor):
+        return self
+
+
+def _graded_offsets(range_min, range_max, step, ratio):
+    # as NumberPlane._get_lines_parallel_to_axis: in each run from 0, every
+    # ratio-th line is a full one and the ones in between are faded
+    ratio = ratio or 1
+    step = step / ratio
+    runs = [
+        np.zeros(1),
+        np.arange(step, min(range_max - range_min, range_max), step),
+        np.arange(-step, max(range_min - range_max, range_min), -step),
+    ]
+    faded = [(np.arange(len(run)) + 1) % ratio != 0 for run in runs]
+    return np.concatenate(runs), np.concatenate(faded)
+
+
+def _line_curves(segments):
+    """``(N, 2, 2)`` plane segments as the points of N straight cubic curves."""
+    starts = np.pad(segments[:, 0], ((0, 0), (0, 1)))
+    ends = np.pad(segments[:, 1], ((0, 0), (0, 1)))
+    # Line puts its handles at the thirds
+    fractions = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+    return (starts[:, None, :] + fractions * (ends - starts)[:, None, :]).reshape(-1, 3)
+
+
+def _subdivision_matrix(pieces):
+    """``(4 * pieces, 4)`` map from a cubic's control points to those of its
+    ``pieces`` equal parts."""
+    t = np.linspace(0, 1, pieces + 1)
+
+    def bernstein(t):
+        return np.stack([(1 - t) ** 3, 3 * t * (1 - t) ** 2, 3 * t ** 2 * (1 - t), t ** 3], axis=1)
+
+    def derivative(t):
+        return 3 * np.stack([-(1 - t) ** 2, (1 - t) * (1 - 3 * t), t * (2 - 3 * t), t ** 2], axis=1)
+
+    a, b = t[:-1], t[1:]
+    # the handles of a part are its ends pushed along the tangent by a third
+    # of the part's length in t
+    third = ((b - a) / 3)[:, None]
+    rows = np.stack([
+        bernstein(a),
+        bernstein(a) + third * derivative(a),
+        bernstein(b) - third * derivative(b),
+        bernstein(b),
+    ], axis=1)
+    return rows.reshape(-1, 4)
+
+
+class _PlaneLines(VMobject):
+    """The lines of one style of a :class:`CompactPlane`."""
+
+    def __deepcopy__(self, clone_from_id):
+        share_points(self, clone_from_id)
+        return super().__deepcopy__(clone_from_id)
+
+
+class CompactPlane(VGroup):
+    """Drop-in for ``NumberPlane`` (ranges containing 0) that keeps every line.
+
+    ``segments`` holds the ends of all lines in plane coordinates and
+    ``line_styles`` the index of each line's style (:attr:`FADED`,
+    :attr:`BACKGROUND` or :attr:`AXES`). ``faded_lines``, ``background_lines``
+    and ``axes`` are one VMobject each, drawn in that order, whose curves are
+    the lines of that style. Non-linear warps work as on ``NumberPlane``,
+    which never smooths its lines after ``apply_function`` either; use
+    :class:`ViewportPlane` for planes that are only moved by matrices.
+    """
+
+    FADED, BACKGROUND, AXES = range(3)
+
+    def __init__(
+        self,
+        x_range=(-config["frame_x_radius"], config["frame_x_radius"], 1),
+        y_range=(-config["frame_y_radius"], config["frame_y_radius"], 1),
+        background_line_style=None,
+        faded_line_style=None,
+        faded_line_ratio=1,
+        axis_config=None,
+        make_smooth_after_applying_functions=False,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.x_range = (list(x_range) + [1])[:3]
+        self.y_range = (list(y_range) + [1])[:3]
+        x_min, x_max, x_step = self.x_range
+        y_min, y_max, y_step = self.y_range
+        if not (x_min <= 0 <= x_max and y_min <= 0 <= y_max):
+            raise ValueError("CompactPlane ranges must contain 0")
+        self.make_smooth_after_applying_functions = make_smooth_after_applying_functions
+
+        self.background_line_style = {
+            "stroke_color": BLUE_D,
+            "stroke_width": 2,
+            "stroke_opacity": 1,
+        }
+        self.background_line_style.update(background_line_style or {})
+        if faded_line_style is None:
+            # NumberPlane halves everything numeric
+            faded_line_style = {
+                key: value * 0.5 if isinstance(value, numbers.Number) else value
+                for key, value in self.background_line_style.items()
+            }
+        self.faded_line_style = faded_line_style
+        self.axis_config = {"stroke_color": WHITE, "stroke_width": 2, "stroke_opacity": 1}
+        self.axis_config.update(axis_config or {})
+
+        # lines parallel to the x axis first, then to the y axis, then the
+        # x and y axes, like NumberPlane
+        ys, y_faded = _graded_offsets(y_min, y_max, y_step, faded_line_ratio)
+        xs, x_faded = _graded_offsets(x_min, x_max, x_step, faded_line_ratio)
+        starts = [(x_min, y) for y in ys] + [(x, y_min) for x in xs] + [(x_min, 0), (0, y_min)]
+        ends = [(x_max, y) for y in ys] + [(x, y_max) for x in xs] + [(x_max, 0), (0, y_max)]
+        self.segments = np.stack([starts, ends], axis=1).astype(float)
+        self.line_styles = np.concatenate([
+            np.where(np.concatenate([y_faded, x_faded]), self.FADED, self.BACKGROUND),
+            [self.AXES, self.AXES],
+        ])
+
+        layers = []
+        for style, style_config in [
+            (self.FADED, self.faded_line_style),
+            (self.BACKGROUND, self.background_line_style),
+            (self.AXES, self.axis_config),
+        ]:
+            layer = _PlaneLines()
+            segments = self.segments[self.line_styles == style]
+            if len(segments):
+                layer.set_points(_line_curves(segments))
+            layers.append(layer.set_style(**style_config))
+        self.faded_lines, self.background_lines, self.axes = layers
+        self.add(*layers)
+
+        # centred on the middle of the ranges, like Axes
+        self.shift(-np.array([(x_min + x_max) / 2, (y_min + y_max) / 2, 0]))
+
+    def __deepcopy__(self, clone_from_id):
+        share_arrays(clone_from_id, self.segments, self.line_styles)
+        return super().__deepcopy__(clone_from_id)
+
+    def coords_to_point(self, *coords):
+        # as Axes: along each axis from its start to its end; the x axis
+        # holds the first half of the points, split or not, the y axis the rest
+        half = len(self.axes.points) // 2
+        x_axis = self.axes.points[[0, half - 1]]
+        y_axis = self.axes.points[[half, -1]]
+
+        def along(axis, number, number_range):
+            low, high = number_range[:2]
+            return axis[0] + (number - low) / (high - low) * (axis[1] - axis[0])
+
+        origin = along(x_axis, 0, self.x_range)
+        return along(x_axis, coords[0], self.x_range) + along(y_axis, coords[1], self.y_range) - origin
+
+    def c2p(self, *coords):
+        return self.coords_to_point(*coords)
+
+    def get_origin(self):
+        return self.coords_to_point(0, 0)
+
+    def prepare_for_nonlinear_transform(self, num_inserted_curves=50):
+        """Split every line into ``num_inserted_curves`` curves, as NumberPlane does."""
+        matrix = _subdivision_matrix(num_inserted_curves)
+        layers = [self.faded_lines, self.background_lines, self.axes]
+        for style, layer in enumerate(layers):
+            # lines that were split already have more than one curve each
+            if not layer.has_points() or layer.get_num_curves() != np.sum(self.line_styles == style):
+                continue
+            curves = layer.points.reshape(-1, 4, 3)
+            layer.set_points(np.einsum("pk,nkd->npd", matrix, curves).reshape(-1, 3))
+        return self
@@ -0,0 +1,73 @@
+"""Vector coordinate labels that are only rebuilt when their value changes."""
+
+from collections import OrderedDict
+
+import numpy as np
+from manim import LARGE_BUFF, Matrix, VGroup
+
+
+class CoordinateLabel(VGroup):
+    """Same look as ``vector.coordinate_label()``, for use in updaters.
+
+    ``refresh()`` compares the rounded coordinates with the ones on display
+    and only swaps in a new matrix when they differ. Matrices are kept in a
+    bounded LRU cache shared by all labels, so going back to a value that was
+    shown before (e.g. the start of an ApplyMatrix) costs a copy, not a
+    typesetting pass::
+
+        label = CoordinateLabel(vector).next_to(vector.get_end())
+        label.add_updater(lambda m: m.refresh().next_to(vector.get_end()))
+    """
+
+    cache_size = 64
+    _templates = OrderedDict()
+
+    def __init__(self, vector, integer_labels=True, n_dim=2, color=None, **kwargs):
+        super().__init__()
+        self.vector = vector
+        self.integer_labels = integer_labels
+        self.n_dim = n_dim
+        self.label_color = color
+        self.matrix_kwargs = kwargs
+        self.coordinates = None
+        self.refresh()
+
+    def __deepcopy__(self, clone_from_id):
+        # copies (animation start/target states) still label the same vector
+        clone_from_id.setdefault(id(self.vector), self.vector)
+        return super().__deepcopy__(clone_from_id)
+
+    def get_coordinates(self):
+        vect = np.array(self.vector.get_end())[: self.n_dim]
+        if self.integer_labels:
+            return tuple(int(x) for x in np.round(vect))
+        # rounded like Matrix's default element formatting would show them
+        return tuple(round(float(x), 2) for x in vect)
+
+    def refresh(self):
+        coordinates = self.get_coordinates()
+        if coordinates == self.coordinates:
+            return self
+        center = self.get_center() if self.submobjects else None
+        self.submobjects = [self._template(coordinates).copy()]
+        if center is not None:
+            self.move_to(center)
+        self.coordinates = coordinates
+        return self
+
+    def _template(self, coordinates):
+        # as Vector.coordinate_label: no colour means the vector's
+        color = self.label_color if self.label_color is not None else self.vector.get_color()
+        key = (coordinates, str(color), repr(sorted(self.matrix_kwargs.items())))
+        templates = CoordinateLabel._templates
+        if key in templates:
+            templates.move_to_end(key)
+            return templates[key]
+        label = Matrix(np.array(coordinates).reshape((self.n_dim, 1)), **self.matrix_kwargs)
+        # same scale Vector.coordinate_label applies
+        label.scale(LARGE_BUFF - 0.2)
+        label.set_color(color)
+        templates[key] = label
+        if len(templates) > self.cache_size:
+            templates.popitem(last=False)
+        return label
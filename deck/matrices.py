@@ -0,0 +1,48 @@
+"""Bracketed matrices with coloured columns, typeset in one LaTeX pass."""
+
+import numpy as np
+from manim import BLUE, DOWN, RED, RIGHT, SingleStringMathTex, VGroup
+
+from .glyphs import matrix_source, split_glyphs
+
+
+class ColumnMatrix(VGroup):
+    """``[`` column ... column ``]`` with each column in its own colour.
+
+    Same layout as assembling the matrix by hand from one ``MathTex`` per
+    entry plus ``MathTex("[").scale(2.0)`` brackets, but the brackets and all
+    entries are typeset as a single formula and its glyphs are then split
+    into entries and laid out. Entries must be numbers, whose glyphs can be
+    counted from their text (one per character).
+
+    The submobjects are ``[left_bracket, column, ..., right_bracket]`` and
+    each column holds one VGroup of glyphs per entry::
+
+        matrix = ColumnMatrix([[2, 1], [1, 1]]).next_to(label, RIGHT)
+    """
+
+    def __init__(self, matrix, column_colors=(RED, BLUE), v_buff=0.3, h_buff=0.5,
+                 bracket_scale=2.0, **kwargs):
+        super().__init__(**kwargs)
+        rows = [[str(entry) for entry in row] for row in np.array(matrix).tolist()]
+        # column by column, so the glyphs come out in the order we lay them out
+        entries = [list(column) for column in zip(*rows)]
+        glyphs = SingleStringMathTex(matrix_source(entries)).submobjects
+        left, cells, right = split_glyphs(glyphs, entries)
+
+        left_bracket = VGroup(left).scale(bracket_scale)
+        right_bracket = VGroup(right).scale(bracket_scale)
+        columns = [
+            VGroup(*[VGroup(*cell) for cell in column])
+            .arrange(DOWN, buff=v_buff)
+            .set_color(column_colors[index % len(column_colors)])
+            for index, column in enumerate(cells)
+        ]
+        self.add(left_bracket, *columns, right_bracket)
+        self.arrange(RIGHT, buff=h_buff)
+
+    def get_columns(self):
+        return VGroup(*self.submobjects[1:-1])
+
+    def get_brackets(self):
+        return VGroup(self.submobjects[0], self.submobjects[-1])
@@ -0,0 +1,67 @@
+"""The few boxes of an MP4 file :mod:`deck.slides` needs to index it."""
+
+import struct
+
+
+def _boxes(file, start, end):
+    """Yield ``(type, offset, header_size, size)`` for the boxes in ``[start, end)``."""
+    offset = start
+    while offset + 8 <= end:
+        file.seek(offset)
+        size, box_type = struct.unpack(">I4s", file.read(8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", file.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            raise ValueError(f"corrupt MP4 box at byte {offset}")
+        yield box_type.decode("latin-1"), offset, header_size, size
+        offset += size
+
+
+def _find(file, start, end, path):
+    """Offsets ``(body_start, body_end)`` of the first box along ``path``."""
+    for box_type, offset, header_size, size in _boxes(file, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return offset + header_size, offset + size
+            found = _find(file, offset + header_size, offset + size, path[1:])
+            if found:
+                return found
+    return None
+
+
+def read_fragments(path):
+    """Return ``(init_size, timescale, [(byte_offset, start_seconds), ...])``.
+
+    One entry per ``moof`` of a fragmented MP4 with a single video track.
+    """
+    with open(path, "rb") as file:
+        end = file.seek(0, 2)
+        mdhd = _find(file, 0, end, ["moov", "trak", "mdia", "mdhd"])
+        if mdhd is None:
+            raise ValueError(f"{path} has no video track")
+        file.seek(mdhd[0])
+        version = file.read(1)[0]
+        # version, flags, creation and modification time precede the timescale
+        file.seek(mdhd[0] + (20 if version == 1 else 12))
+        timescale = struct.unpack(">I", file.read(4))[0]
+
+        init_size = None
+        fragments = []
+        for box_type, offset, header_size, size in _boxes(file, 0, end):
+            if box_type != "moof":
+                continue
+            if init_size is None:
+                init_size = offset
+            tfdt = _find(file, offset + header_size, offset + size, ["traf", "tfdt"])
+            file.seek(tfdt[0])
+            version = file.read(4)[0]
+            if version == 1:
+                decode_time = struct.unpack(">Q", file.read(8))[0]
+            else:
+                decode_time = struct.unpack(">I", file.read(4))[0]
+            fragments.append((offset, decode_time / timescale))
+    return init_size, timescale, fragments
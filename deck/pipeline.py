@@ -0,0 +1,104 @@
+"""Bounded frame queue between the rasterizer and ffmpeg.
+
+:class:`FramePipe` owns a ring of ``depth`` frame buffers. The renderer
+takes a free buffer, rasterizes the next frame straight into it and queues
+it; a writer thread pipes queued buffers into ffmpeg's stdin as they are
+(no ``tobytes``, no copy) and hands them back to the ring. Frames that
+were not drawn in a buffer of the ring are copied into one. When every buffer is queued
+or being written, the renderer waits for ffmpeg (backpressure); the time
+it spends waiting is ``stall``, the time the writer thread spends waiting
+for frames is ``starve``. A renderer that mostly stalls wants a deeper
+queue or a faster encoder, one whose writer mostly starves is bound by
+rasterizing.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class FramePipe:
+    def __init__(self, depth=4):
+        if depth < 1:
+            raise ValueError(f"frame queue depth must be at least 1, not {depth}")
+        self.depth = depth
+        # buffers are allocated on first use, shaped like the frames
+        self.free = queue.Queue()
+        # ids of the buffers allocated so far
+        self.buffers = set()
+        for _ in range(depth):
+            self.free.put(None)
+        self.ready = queue.Queue()
+        self.thread = None
+        self.error = None
+        self.stall = 0.0
+        self.starve = 0.0
+
+    def acquire(self, like):
+        """A free buffer shaped like ``like``; waits while all are in use."""
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            start = time.perf_counter()
+            buffer = self.free.get()
+            self.stall += time.perf_counter() - start
+        if buffer is None or buffer.shape != like.shape or buffer.dtype != like.dtype:
+            if buffer is not None:
+                self.buffers.discard(id(buffer))
+            buffer = np.empty_like(like, order="C")
+            self.buffers.add(id(buffer))
+        return buffer
+
+    def owns(self, buffer):
+        """Whether ``buffer`` was handed out by :meth:`acquire`."""
+        return id(buffer) in self.buffers
+
+    def release(self, buffer):
+        """Return a buffer that was acquired but not submitted."""
+        self.free.put(buffer)
+
+    def submit(self, buffer, num_frames=1):
+        """Queue ``buffer`` to be written ``num_frames`` times, then freed."""
+        self.raise_error()
+        self.ready.put((buffer, num_frames))
+
+    def start(self, stream):
+        """Write queued frames to ``stream`` on a writer thread until :meth:`join`."""
+        self.thread = threading.Thread(
+            target=self._write, args=(stream,), name="deck-frame-writer", daemon=True
+        )
+        self.thread.start()
+
+    def join(self):
+        """Wait until everything queued is written and stop the writer thread."""
+        if self.thread is not None:
+            self.ready.put(None)
+            self.thread.join()
+            self.thread = None
+        self.raise_error()
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _write(self, stream):
+        while True:
+            start = time.perf_counter()
+            item = self.ready.get()
+            self.starve += time.perf_counter() - start
+            if item is None:
+                return
+            buffer, num_frames = item
+            try:
+                if self.error is None:
+                    data = memoryview(buffer).cast("B")
+                    for _ in range(num_frames):
+                        stream.write(data)
+            except Exception as e:
+                # e.g. ffmpeg exited; raised on the rendering thread
+                self.error = e
+            finally:
+                self.free.put(buffer)
@@ -0,0 +1,312 @@
+"""Opt-in timing of where a scene's render time goes, per section.
+
+While :func:`profiling` is active, a handful of manim methods are wrapped so
+that wall time is charged to one of :data:`PHASES` (the innermost running
+phase wins, so the ``Tex`` built inside an updater counts as LaTeX, not as
+updater time) and to the section the scene is currently in. Whatever is
+left over (``construct`` code, animation setup, hashing) is reported as
+``other``. Encoding done after the last section, when manim concatenates
+the partial movie files, is reported as a ``(finish)`` section.
+
+Each section also reports the mean share of the frame's pixels that
+:class:`~deck.renderer.DeckRenderer` repainted per rendered frame
+(``touched``), which is 0 for held frames and below 1 for frames drawn
+as dirty rectangles.
+
+Only the main thread is timed. ffmpeg is fed from a writer thread (see
+:mod:`deck.pipeline`), so ``encode`` is the time spent handing frames over
+and closing partial movies, and ``stall`` the time spent waiting for a free
+frame buffer because the encoder is behind. When extra resolutions are
+written (see :mod:`deck.resolutions`), waiting for their worker threads
+counts as ``rasterize``, and frames are counted for the main output only.
+
+The report also has the hit rates of the :mod:`deck.text_cache` layout and
+outline caches over the block (``caches``).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import MarkupText, Scene, SingleStringMathTex, Text
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from . import text_cache
+from .pipeline import FramePipe
+from .renderer import DeckRenderer
+from .resolutions import MultiResolutionRenderer, ScaledFileWriter, ScaledRenderer
+from .writer import DeckFileWriter
+
+PHASES = ("latex", "text", "animation", "updaters", "rasterize", "encode", "stall")
+
+PROFILE_DIR = Path(os.environ.get("DECK_PROFILE_DIR", "media/profiles"))
+
+# (classes, method, phase); a method is wrapped on every class that defines
+# it, so overrides calling super() are timed as a whole
+TIMED_METHODS = [
+    ((SingleStringMathTex,), "__init__", "latex"),
+    ((Text, MarkupText), "__init__", "text"),
+    ((Scene,), "begin_animations", "animation"),
+    ((Scene,), "update_to_time", "animation"),
+    ((Scene,), "update_mobjects", "updaters"),
+    ((CairoRenderer, DeckRenderer), "update_frame", "rasterize"),
+    ((CairoRenderer,), "get_frame", "rasterize"),
+    ((MultiResolutionRenderer,), "wait_for_outputs", "rasterize"),
+    ((SceneFileWriter, DeckFileWriter), "write_frame", "encode"),
+    ((DeckFileWriter,), "hold_frame", "encode"),
+    ((DeckFileWriter,), "flush_held_frame", "encode"),
+    ((FramePipe,), "acquire", "stall"),
+    ((SceneFileWriter, DeckFileWriter), "close_movie_pipe", "encode"),
+    ((SceneFileWriter, DeckFileWriter), "combine_files", "encode"),
+    ((SceneFileWriter, DeckFileWriter), "combine_to_section_videos", "encode"),
+]
+
+_active = None
+
+
+class SceneProfile:
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.sections = []
+        self._stack = []
+        self._mark = None
+        self._cache_stats = None
+        self.caches = {}
+
+    def start(self):
+        self._mark = time.perf_counter()
+        self._cache_stats = text_cache.stats()
+        self.start_section("(setup)")
+
+    def stop(self):
+        self._charge()
+        # the caches count per process, so keep what this block added
+        self.caches = {
+            cache: {
+                outcome: count - self._cache_stats[cache][outcome]
+                for outcome, count in counts.items()
+            }
+            for cache, counts in text_cache.stats().items()
+        }
+
+    def start_section(self, name):
+        self._charge()
+        phases = dict.fromkeys(PHASES + ("other",), 0.0)
+        self.sections.append({
+            "name": name, "frames": 0, "phases": phases, "rendered": 0, "repainted": 0.0,
+        })
+
+    def enter(self, phase):
+        self._charge()
+        self._stack.append(phase)
+
+    def exit(self):
+        self._charge()
+        self._stack.pop()
+
+    def count_frames(self, num_frames=1):
+        self.sections[-1]["frames"] += num_frames
+
+    def count_touched(self, fraction):
+        self.sections[-1]["rendered"] += 1
+        self.sections[-1]["repainted"] += fraction
+
+    def _charge(self):
+        now = time.perf_counter()
+        if self.sections:
+            phase = self._stack[-1] if self._stack else "other"
+            self.sections[-1]["phases"][phase] += now - self._mark
+        self._mark = now
+
+    def report(self):
+        sections = []
+        for section in self.sections:
+            wall = sum(section["phases"].values())
+            frames = section["frames"]
+            rendered = section["rendered"]
+            sections.append({
+                **section,
+                "wall": wall,
+                "ms_per_frame": 1000 * wall / frames if frames else None,
+                "touched": section["repainted"] / rendered if rendered else None,
+            })
+        rendered = sum(section["rendered"] for section in sections)
+        return {
+            "scene": self.scene_name,
+            "wall": sum(section["wall"] for section in sections),
+            "frames": sum(section["frames"] for section in sections),
+            "touched": (
+                sum(section["repainted"] for section in sections) / rendered
+                if rendered else None
+            ),
+            "sections": sections,
+            "caches": self.caches,
+        }
+
+
+def _timed(phase, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        # worker threads run alongside the main one, which is what is timed
+        if _active is None or threading.current_thread() is not threading.main_thread():
+            return method(*args, **kwargs)
+        _active.enter(phase)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _active.exit()
+
+    return wrapper
+
+
+def _counted(obj):
+    # the extra outputs of deck.resolutions add time, not frames or sections
+    return _active is not None and not isinstance(obj, (ScaledFileWriter, ScaledRenderer))
+
+
+def _counting(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _counted(self):
+            _active.count_frames()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _counting_held(method):
+    @functools.wraps(method)
+    def wrapper(self, num_frames=1):
+        if _counted(self):
+            _active.count_frames(num_frames)
+        return method(self, num_frames)
+
+    return wrapper
+
+
+def _recording_touched(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if _counted(self) and not self.skip_animations:
+            _active.count_touched(self.touched_fraction)
+        return result
+
+    return wrapper
+
+
+def _starting_section(method, name=None):
+    # without a name, the section is the one SceneFileWriter.next_section opens
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _counted(self) and name is not None:
+            _active.start_section(name)
+        result = method(self, *args, **kwargs)
+        if _counted(self) and name is None:
+            _active.start_section(args[0] if args else kwargs.get("name", "unnamed"))
+        return result
+
+    return wrapper
+
+
+def _patches():
+    """``(owner, method, make_wrapper)`` for every method to wrap."""
+    patches = []
+    for owners, name, phase in TIMED_METHODS:
+        for owner in owners:
+            if name in owner.__dict__:
+                patches.append((owner, name, functools.partial(_timed, phase)))
+    # frames reach the encoder through DeckFileWriter, one by one or held
+    patches.append((DeckFileWriter, "write_frame", _counting))
+    patches.append((DeckFileWriter, "hold_frame", _counting_held))
+    patches.append((DeckRenderer, "render", _recording_touched))
+    patches.append((SceneFileWriter, "next_section", _starting_section))
+    patches.append((SceneFileWriter, "finish",
+                    functools.partial(_starting_section, name="(finish)")))
+    return patches
+
+
+@contextmanager
+def profiling(scene_name):
+    """Profile everything rendered in the block; yields the :class:`SceneProfile`.
+
+    Wrap the construction of the scene as well as ``render()``, so that the
+    sections created by the file writer are seen.
+    """
+    global _active
+    profile = SceneProfile(scene_name)
+    originals = []
+    for owner, name, make_wrapper in _patches():
+        # a method can be patched twice (timed and counted), so always wrap
+        # whatever is installed now
+        originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, make_wrapper(owner.__dict__[name]))
+    _active = profile
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active = None
+        for owner, name, original in reversed(originals):
+            setattr(owner, name, original)
+
+
+def report_path(scene_key):
+    return PROFILE_DIR / f"{scene_key}.json"
+
+
+def save_report(scene_key, report):
+    path = report_path(scene_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=4))
+    return path
+
+
+def load_report(scene_key):
+    return json.loads(report_path(scene_key).read_text())
+
+
+def print_report(report):
+    columns = PHASES + ("other",)
+    width = max([len(section["name"]) for section in report["sections"]] + [7])
+    header = f"{'Section':<{width}}  {'Frames':>6}  {'ms/frame':>8}  {'Touched':>7}"
+    header += "".join(f"  {column:>9}" for column in columns) + f"  {'Wall (s)':>9}"
+
+    totals = dict.fromkeys(columns, 0.0)
+    for section in report["sections"]:
+        for phase, seconds in section["phases"].items():
+            totals[phase] += seconds
+    total = {
+        "name": "Total",
+        "frames": report["frames"],
+        "phases": totals,
+        "wall": report["wall"],
+        "ms_per_frame": 1000 * report["wall"] / report["frames"] if report["frames"] else None,
+        "touched": report.get("touched"),
+    }
+
+    print(f"\n{report['scene']}")
+    print(header)
+    print("-" * len(header))
+    for section in report["sections"] + [total]:
+        ms = section["ms_per_frame"]
+        row = f"{section['name']:<{width}}  {section['frames']:>6}  "
+        row += f"{ms:>8.1f}" if ms is not None else f"{'-':>8}"
+        touched = section.get("touched")
+        row += f"  {touched:>7.1%}" if touched is not None else f"  {'-':>7}"
+        row += "".join(f"  {section['phases'][column]:>9.2f}" for column in columns)
+        print(row + f"  {section['wall']:>9.2f}")
+
+    caches = []
+    for cache, counts in report.get("caches", {}).items():
+        lookups = counts["hits"] + counts["misses"]
+        if lookups:
+            caches.append(f"{cache} {counts['hits']}/{lookups} ({counts['hits'] / lookups:.0%})")
+    if caches:
+        print("Text cache hits: " + ", ".join(caches))
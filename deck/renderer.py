@@ -0,0 +1,385 @@
+"""Cairo renderer used for every scene rendered through ``python -m deck``."""
+
+import inspect
+from collections import deque
+from contextlib import contextmanager
+
+import cairo
+import numpy as np
+from manim import Camera, ThreeDCamera, VMobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.iterables import list_update
+
+from .camera import ProjectedThreeDCamera, pixel_bounds
+from .fingerprint import frame_fingerprint
+from .writer import DeckFileWriter
+
+# cameras swapped for a faster equivalent when a scene asks for them
+FAST_CAMERAS = {ThreeDCamera: ProjectedThreeDCamera}
+
+
+def _animated_mobjects(animation):
+    yield animation.mobject
+    # deck.transforms animations point ``mobject`` at one of their targets
+    yield from getattr(animation, "targets", ())
+    for sub_animation in getattr(animation, "animations", ()):
+        yield from _animated_mobjects(sub_animation)
+
+
+def _camera_mobjects(camera):
+    if hasattr(camera, "get_value_trackers"):
+        return camera.get_value_trackers() + [camera._frame_center]
+    if hasattr(camera, "get_mobjects_indicating_movement"):
+        return camera.get_mobjects_indicating_movement()
+    return []
+
+
+def split_layers(scene, camera):
+    """Split what ``scene`` draws during the current play into layers.
+
+    Returns ``(below, moving, above, touched)``: the top-level mobjects drawn
+    before the first one an animation or updater touches, those from there
+    to the last one touched, the untouched ones drawn after that, and the
+    outermost touched mobjects within ``moving``. Like manim's own split,
+    the layers hold top-level mobjects whose families are expanded when
+    they are drawn, so children an updater swaps in during the play are
+    drawn too. Returns None when the whole frame has to be redrawn anyway
+    (the camera moves, a scene updater may touch anything, 3D depth sorting
+    may reorder the layers) or nothing drawn moves.
+    """
+    if scene.updaters:
+        return None
+    touched = set()
+    for animation in scene.animations:
+        for mobject in _animated_mobjects(animation):
+            touched.update(mobject.get_family())
+    for mobject in scene.get_mobject_family_members():
+        if mobject.updaters:
+            touched.update(mobject.get_family())
+    if any(mobject in touched for mobject in _camera_mobjects(camera)):
+        return None
+
+    drawn = list_update(scene.mobjects, scene.foreground_mobjects)
+    families = [mobject.get_family() for mobject in drawn]
+    if any(getattr(submob, "shade_in_3d", False) for family in families for submob in family):
+        return None
+    indices = [
+        i for i, family in enumerate(families) if any(submob in touched for submob in family)
+    ]
+    if not indices:
+        return None
+    first, last = indices[0], indices[-1] + 1
+    moving = drawn[first:last]
+    # the touched mobjects whose parent is not, found top down; their
+    # families are taken again on every frame
+    roots = []
+    pending = list(reversed(moving))
+    while pending:
+        mobject = pending.pop()
+        if mobject in touched:
+            roots.append(mobject)
+        else:
+            pending.extend(reversed(mobject.submobjects))
+    return drawn[:first], moving, drawn[last:], roots
+
+
+def _area(rects):
+    # exact for up to two rectangles, an upper bound for more
+    area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+    if len(rects) == 2:
+        (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = rects
+        area -= max(min(ax1, bx1) - max(ax0, bx0), 0) * max(min(ay1, by1) - max(ay0, by0), 0)
+    return area
+
+
+@contextmanager
+def _clipped(camera, rects):
+    """Clip everything ``camera`` draws on its frame to ``rects`` (pixels)."""
+    frame = camera.pixel_array
+    # MovingCamera makes a new context for every draw; the frame holds
+    # still while we're clipping, so hand out one clipped context instead
+    ctx = camera.get_cairo_context(frame)
+    ctx.save()
+    matrix = ctx.get_matrix()
+    ctx.identity_matrix()
+    for x0, y0, x1, y1 in rects:
+        ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+    ctx.clip()
+    ctx.set_matrix(matrix)
+    get_cairo_context = camera.get_cairo_context
+    camera.get_cairo_context = lambda pixel_array: (
+        ctx if pixel_array is frame else get_cairo_context(pixel_array)
+    )
+    try:
+        yield
+    finally:
+        del camera.get_cairo_context
+        ctx.restore()
+
+
+class DeckRenderer(CairoRenderer):
+    """Writes runs of identical frames as one held frame, and only redraws
+    what moves.
+
+    A frame whose moving mobjects and camera are unchanged since the last one
+    (a wait with idle updaters) is neither rasterized nor encoded again; the
+    file writer repeats the previous frame instead.
+
+    manim draws the mobjects below the first moving one once per play and
+    redraws everything from there up. Here the untouched mobjects above the
+    last moving one are also drawn once, into a transparent layer that is
+    composited over each frame (see :func:`split_layers`). After the first
+    frame of a play only the rectangles the touched mobjects covered on the
+    previous frame and cover now are cleared and repainted;
+    ``touched_fraction`` is the share of the frame that was.
+
+    Frames are encoded on a writer thread while the next one is rasterized,
+    through a queue of ``frame_queue_depth`` buffers (see :mod:`deck.pipeline`).
+    The camera draws straight into those buffers. A buffer handed back by
+    the writer still holds an older frame, so the rectangles repainted are
+    those that changed since that frame, not just since the last one.
+    """
+
+    def __init__(self, file_writer_class=DeckFileWriter, slides=False, frame_queue_depth=4,
+                 shard=None, **kwargs):
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+        # (index, count): only render every count-th section, starting at
+        # index, and leave the partial movies to a joining render (deck.runner)
+        self.shard = shard
+        self.playing = False
+        # also join the section videos into one indexed movie (deck.slides)
+        self.slides = slides
+        # frame buffers between rasterizing and the ffmpeg writer thread
+        self.frame_queue_depth = frame_queue_depth
+        self.last_fingerprint = None
+        # the pipe buffer the camera draws in, until it is written
+        self.drawing_buffer = None
+        # number of frames drawn, the frame each buffer holds (by id) and the
+        # rectangles that changed from the frame before to the recent ones
+        self.frames_drawn = 0
+        self.buffer_frames = {}
+        self.frame_changes = deque(maxlen=frame_queue_depth + 2)
+        self.reset_layers()
+        # share of the frame's pixels repainted for the last frame
+        self.touched_fraction = 1.0
+
+    def reset_layers(self):
+        # number of moving mobjects drawn under the overlay, or None
+        self.split = None
+        # (x, y, surface, array) of the untouched mobjects above the moving ones
+        self.overlay = None
+        # touched mobjects whose bounds make up the dirty rectangles, or None
+        # to repaint the whole frame
+        self.changing = None
+        # pixel rectangles the changing mobjects covered on the last frame
+        self.last_rects = None
+
+    def play(self, scene, *args, **kwargs):
+        # the static background is redrawn for every play
+        self.last_fingerprint = None
+        self.playing = True
+        try:
+            super().play(scene, *args, **kwargs)
+        finally:
+            self.playing = False
+            self.reset_layers()
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.reset_layers()
+        if self.skip_animations:
+            self.static_image = None
+            return None
+        layers = split_layers(scene, self.camera)
+        if layers is None:
+            return super().save_static_frame_data(scene, static_mobjects)
+        below, moving, above, touched = layers
+        # mobjects added while playing are appended to scene.moving_mobjects
+        # and end up above the layer
+        scene.moving_mobjects = moving
+        scene.static_mobjects = below + above
+        super().save_static_frame_data(scene, below)
+        self.split = len(moving)
+        if above:
+            self.overlay = self.rasterize_layer(above)
+        # cairo draws these through the clip; images and background images
+        # are pasted into the frame by NumPy and would ignore it
+        if not isinstance(self.camera, ThreeDCamera) and all(
+            isinstance(submob, VMobject) and submob.get_background_image() is None
+            for mob in moving
+            for submob in mob.family_members_with_points()
+        ):
+            self.changing = touched
+        return self.static_image
+
+    def rasterize_layer(self, mobjects):
+        """Draw ``mobjects`` on a transparent frame, cropped to what they cover."""
+        camera = self.camera
+        frame = camera.pixel_array
+        layer = np.zeros_like(frame)
+        camera.pixel_array = layer
+        try:
+            camera.capture_mobjects(mobjects)
+        finally:
+            camera.pixel_array = frame
+            camera.pixel_array_to_cairo_context.pop(id(layer), None)
+        alpha = layer[:, :, 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        columns = np.flatnonzero(alpha.any(axis=0))
+        if not len(rows):
+            return None
+        y0, y1 = rows[0], rows[-1] + 1
+        x0, x1 = columns[0], columns[-1] + 1
+        layer = np.ascontiguousarray(layer[y0:y1, x0:x1])
+        surface = cairo.ImageSurface.create_for_data(
+            layer, cairo.FORMAT_ARGB32, x1 - x0, y1 - y0
+        )
+        return int(x0), int(y0), surface, layer
+
+    def dirty_rects(self, mobjects):
+        """Pixel rectangles that changed since the last frame, or None."""
+        if self.changing is None:
+            return None
+        family = [
+            submob
+            for mob in self.changing + list(mobjects[self.split:])
+            for submob in mob.family_members_with_points()
+        ]
+        matrix = self.camera.get_cairo_context(self.camera.pixel_array).get_matrix()
+        bounds = pixel_bounds(self.camera, family, matrix)
+        rects = [bounds] if bounds is not None else []
+        last_rects, self.last_rects = self.last_rects, rects
+        if last_rects is None:
+            # the first frame of the play is drawn in full
+            return None
+        # clear where they were, draw where they are
+        return last_rects + rects
+
+    def take_frame_buffer(self):
+        """Point the camera at a buffer the file writer is done with.
+
+        Returns the number of the frame the buffer still holds, or None.
+        """
+        camera = self.camera
+        if self.drawing_buffer is None:
+            buffer = self.file_writer.frame_buffer(camera.pixel_array)
+            # None when frames are not piped; the camera keeps its own
+            if buffer is not None:
+                camera.pixel_array = buffer
+                self.drawing_buffer = buffer
+        return self.buffer_frames.get(id(camera.pixel_array))
+
+    def record_frame(self, rects, held=None):
+        """Number the frame about to be drawn and return what to repaint.
+
+        ``rects`` changed since the frame before (None: everything) and
+        ``held`` is the frame the camera's buffer holds. Returns the
+        rectangles that changed since ``held``, or None to redraw it all.
+        """
+        self.frames_drawn += 1
+        frame = self.frames_drawn
+        self.buffer_frames[id(self.camera.pixel_array)] = frame
+        since = [changes for number, changes in self.frame_changes
+                 if held is not None and number > held]
+        self.frame_changes.append((frame, rects))
+        if rects is None or held is None or len(since) != frame - 1 - held:
+            return None
+        if any(changes is None for changes in since):
+            return None
+        return [rect for changes in since for rect in changes] + rects
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True,
+                     ignore_skipping=True, **kwargs):
+        if self.skip_animations and self.playing:
+            # a skipped play (cached, or another shard's section) only
+            # moves the scene to its end state; nothing drawn is kept
+            return
+        if self.skip_animations and not ignore_skipping:
+            return
+        held = self.take_frame_buffer()
+        if self.split is None or not mobjects:
+            self.record_frame(None)
+            self.touched_fraction = 1.0
+            return super().update_frame(
+                scene, mobjects, include_submobjects, ignore_skipping, **kwargs
+            )
+        camera = self.camera
+        rects = self.record_frame(self.dirty_rects(mobjects), held)
+        if rects is None:
+            self.touched_fraction = 1.0
+            if self.static_image is not None:
+                camera.set_frame_to_background(self.static_image)
+            else:
+                camera.reset()
+            self.draw_layers(mobjects, include_submobjects=include_submobjects, **kwargs)
+            return
+        self.touched_fraction = min(_area(rects) / (camera.pixel_width * camera.pixel_height), 1.0)
+        if not rects:
+            return
+        background = self.static_image if self.static_image is not None else camera.background
+        for x0, y0, x1, y1 in rects:
+            camera.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        with _clipped(camera, rects):
+            self.draw_layers(mobjects, include_submobjects=include_submobjects, **kwargs)
+
+    def draw_layers(self, mobjects, **kwargs):
+        camera = self.camera
+        camera.capture_mobjects(mobjects[:self.split], **kwargs)
+        if self.overlay is not None:
+            x, y, surface, _ = self.overlay
+            # cairo's OVER, as if the layer's mobjects were drawn here
+            ctx = camera.get_cairo_context(camera.pixel_array)
+            ctx.save()
+            ctx.identity_matrix()
+            ctx.set_source_surface(surface, x, y)
+            ctx.paint()
+            ctx.restore()
+        if mobjects[self.split:]:
+            camera.capture_mobjects(mobjects[self.split:], **kwargs)
+
+    def render(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return super().render(scene, time, moving_mobjects)
+        fingerprint = frame_fingerprint(self.camera, moving_mobjects)
+        if fingerprint is not None and fingerprint == self.last_fingerprint:
+            self.touched_fraction = 0.0
+            self.hold_frame()
+            return
+        self.last_fingerprint = fingerprint
+        self.update_frame(scene, moving_mobjects)
+        # drawn in a buffer of the file writer's queue (deck.pipeline)
+        self.add_frame(self.camera.pixel_array)
+
+    def freeze_current_frame(self, duration):
+        dt = 1 / self.camera.frame_rate
+        # hand the buffer over as it is unless the writer has it already
+        frame = self.camera.pixel_array if self.drawing_buffer is not None else self.get_frame()
+        self.add_frame(frame, num_frames=int(duration / dt))
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations or num_frames < 1:
+            return
+        self.file_writer.write_frame(frame)
+        if frame is self.drawing_buffer:
+            # the writer owns it now; the next frame is drawn in another
+            self.drawing_buffer = None
+        self.time += 1 / self.camera.frame_rate
+        if num_frames > 1:
+            self.hold_frame(num_frames - 1)
+
+    def hold_frame(self, num_frames=1):
+        self.time += num_frames / self.camera.frame_rate
+        self.file_writer.hold_frame(num_frames)
+
+
+def scene_camera_class(scene_class):
+    # MovingCameraScene/ThreeDScene choose their camera through the default
+    # of ``camera_class``, which is ignored once a renderer is passed in
+    parameter = inspect.signature(scene_class.__init__).parameters.get("camera_class")
+    if parameter is None or parameter.default is inspect.Parameter.empty:
+        return Camera
+    return parameter.default
+
+
+def make_renderer(scene_class, renderer_class=DeckRenderer, **kwargs):
+    camera_class = scene_camera_class(scene_class)
+    return renderer_class(camera_class=FAST_CAMERAS.get(camera_class, camera_class), **kwargs)
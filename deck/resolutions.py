@@ -0,0 +1,203 @@
+"""Several output resolutions from one evaluation of a scene.
+
+:class:`MultiResolutionRenderer` runs ``construct``, the animations, the
+updaters and the LaTeX once, at the resolution of the main quality. Every
+frame's mobjects are then also rasterized by one :class:`ScaledRenderer`
+per extra resolution, each with its own camera and its own file writer, so
+a scene is written at, say, 1080p, 720p and 480p in one pass.
+
+The extra outputs keep the frame rate of the main one and go to the video
+directory manim would use for that size and rate (``480p60`` next to
+``1080p60``). Audio and subcaptions are only written for the main output.
+
+The outputs rasterize each frame on a pool of ``raster_threads`` worker
+threads while the main camera draws it; they only read the mobjects, and
+cairo lets go of the GIL while it fills and strokes.
+"""
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from manim import tempconfig
+
+from .renderer import DeckRenderer
+from .sections import SectionCache
+from .store import DEFAULT_CACHE_DIR
+from .writer import DeckFileWriter
+
+# what the scene moves the camera with; the outputs share the main camera's
+# (MovingCamera's frame, ThreeDCamera's trackers and fixed mobjects)
+CAMERA_STATE = [
+    "frame",
+    "_frame_center",
+    "phi_tracker",
+    "theta_tracker",
+    "gamma_tracker",
+    "focal_distance_tracker",
+    "zoom_tracker",
+    "light_source",
+    "fixed_in_frame_mobjects",
+    "fixed_orientation_mobjects",
+]
+
+
+class ScaledFileWriter(DeckFileWriter):
+    """File writer of a :class:`ScaledRenderer`.
+
+    Partial movies are named after the hashes of the main output's plays,
+    so the cross-run cache of every size is kept apart.
+    """
+
+    section_caches = {}
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        camera = renderer.camera
+        size = (camera.pixel_width, camera.pixel_height)
+        # the output directories are named after the pixel height in config
+        with tempconfig({"pixel_width": size[0], "pixel_height": size[1]}):
+            super().__init__(renderer, scene_name, **kwargs)
+        if self.section_cache is not None:
+            if size not in self.section_caches:
+                self.section_caches[size] = SectionCache(root=DEFAULT_CACHE_DIR / ("%dx%d" % size))
+            self.section_cache = self.section_caches[size]
+
+
+class ScaledRenderer(DeckRenderer):
+    """Rasterizes and encodes the frames of a :class:`MultiResolutionRenderer`
+    at another pixel size. Never plays a scene itself."""
+
+    def __init__(self, pixel_width, pixel_height, camera_class, **kwargs):
+        super().__init__(
+            file_writer_class=ScaledFileWriter,
+            camera_class=functools.partial(
+                camera_class, pixel_width=pixel_width, pixel_height=pixel_height
+            ),
+            **kwargs,
+        )
+
+    def follow(self, camera):
+        """Look through ``camera`` wherever the scene points it."""
+        for name in CAMERA_STATE:
+            if hasattr(camera, name):
+                setattr(self.camera, name, getattr(camera, name))
+
+
+class MultiResolutionFileWriter(DeckFileWriter):
+    """Passes every step of a play on to the file writers of the extra outputs."""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        # SceneFileWriter.__init__ opens the first section of every writer
+        self.extra_writers = []
+        super().__init__(renderer, scene_name, **kwargs)
+        self.extra_writers = [output.file_writer for output in renderer.outputs]
+
+    def is_already_cached(self, hash_invocation):
+        # a play is only skipped if no output has to render it
+        return super().is_already_cached(hash_invocation) and all(
+            writer.is_already_cached(hash_invocation) for writer in self.extra_writers
+        )
+
+    def add_partial_movie_file(self, hash_animation):
+        super().add_partial_movie_file(hash_animation)
+        for writer in self.extra_writers:
+            writer.add_partial_movie_file(hash_animation)
+
+    def next_section(self, name, type, skip_animations):
+        super().next_section(name, type, skip_animations)
+        for writer in self.extra_writers:
+            writer.next_section(name, type, skip_animations)
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        super().begin_animation(allow_write, file_path)
+        for writer in self.extra_writers:
+            # the outputs follow the main renderer play by play
+            writer.renderer.num_plays = self.renderer.num_plays
+            writer.renderer.skip_animations = self.renderer.skip_animations
+            writer.begin_animation(allow_write)
+
+    def end_animation(self, allow_write=False):
+        super().end_animation(allow_write)
+        for writer in self.extra_writers:
+            writer.end_animation(allow_write)
+
+    def finish(self):
+        super().finish()
+        for writer in self.extra_writers:
+            writer.finish()
+
+
+class MultiResolutionRenderer(DeckRenderer):
+    """:class:`~deck.renderer.DeckRenderer` that also writes the scene at
+    each ``(pixel_width, pixel_height)`` in ``resolutions``."""
+
+    def __init__(self, resolutions=(), file_writer_class=MultiResolutionFileWriter,
+                 raster_threads=None, **kwargs):
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+        self.outputs = [
+            ScaledRenderer(
+                width, height, type(self.camera),
+                slides=self.slides, frame_queue_depth=self.frame_queue_depth,
+                shard=self.shard,
+            )
+            for width, height in resolutions
+        ]
+        for output in self.outputs:
+            output.follow(self.camera)
+        self.pool = ThreadPoolExecutor(
+            max_workers=raster_threads or max(len(self.outputs), 1),
+            thread_name_prefix="deck-raster",
+        )
+        self.scene = None
+
+    def init_scene(self, scene):
+        self.scene = scene
+        # the main file writer picks up the outputs' writers
+        for output in self.outputs:
+            output.init_scene(scene)
+        super().init_scene(scene)
+
+    def play(self, scene, *args, **kwargs):
+        for output in self.outputs:
+            output.last_fingerprint = None
+        try:
+            super().play(scene, *args, **kwargs)
+        finally:
+            for output in self.outputs:
+                output.reset_layers()
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        static_image = super().save_static_frame_data(scene, static_mobjects)
+        if self.skip_animations:
+            return static_image
+        # split_layers only looks at the scene, so every output splits the
+        # same way the main camera did
+        for output in self.outputs:
+            output.save_static_frame_data(scene, static_mobjects)
+        return static_image
+
+    def render(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return super().render(scene, time, moving_mobjects)
+        futures = [
+            self.pool.submit(output.render, scene, time, moving_mobjects)
+            for output in self.outputs
+        ]
+        super().render(scene, time, moving_mobjects)
+        self.wait_for_outputs(futures)
+
+    def wait_for_outputs(self, futures):
+        # the scene may only move on once every output has drawn the frame
+        for future in futures:
+            future.result()
+
+    def freeze_current_frame(self, duration):
+        super().freeze_current_frame(duration)
+        if self.skip_animations:
+            return
+        for output in self.outputs:
+            output.update_frame(self.scene, mobjects=self.scene.moving_mobjects)
+            output.freeze_current_frame(duration)
+
+    def scene_finished(self, scene):
+        self.pool.shutdown()
+        super().scene_finished(scene)
@@ -0,0 +1,286 @@
+"""Render every scene of the deck on a process pool.
+
+Scenes are discovered by importing the chapter modules, so a new Scene class
+is picked up without touching this file. Each worker renders one scene
+in-process with its own manim ``config``; all workers share the media dir
+and the on-disk caches from :mod:`deck.tex_cache` and :mod:`deck.text_cache`.
+
+A long scene can also be split across workers by section. Each of
+``shards`` workers runs the whole ``construct``, but only rasterizes and
+encodes every ``shards``-th section; the plays of the other sections are
+skipped, which moves the scene to their end state without drawing. Once
+all shards are done, one more render of the scene finds every play's
+partial movie cached and only joins them into the scene and section
+videos.
+"""
+
+import importlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from pathlib import Path
+
+from manim import Scene, tempconfig
+from manim.constants import QUALITIES
+
+from . import dryrun, profiler, tex_batch, tex_cache
+from .draft import DRAFT_CONFIG, DraftRenderer
+from .dryrun import DRY_RUN_CONFIG, DryRunError, DryRunRenderer
+from .renderer import DeckRenderer, make_renderer
+from .resolutions import MultiResolutionRenderer
+from .store import DEFAULT_CACHE_DIR
+
+CHAPTER_MODULES = ["chapter1", "chapter2"]
+
+QUALITY_FLAGS = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Known to dominate the deck; used to order the queue until we have timings.
+SLOW_SCENES = [
+    "MatrixRepresentationOfTransformations3D",
+    "PropertiesOfLinearTransformations",
+]
+
+TIMINGS_FILE = DEFAULT_CACHE_DIR / "scene_timings.json"
+
+
+def discover_scenes(module_names=CHAPTER_MODULES):
+    """Return ``(module_name, scene_name)`` for every Scene defined in the modules."""
+    scenes = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            # skip Scene/MovingCameraScene/ThreeDScene pulled in by `import *`
+            if issubclass(obj, Scene) and obj.__module__ == module.__name__:
+                scenes.append((module_name, name))
+    return scenes
+
+
+def load_timings():
+    try:
+        return json.loads(TIMINGS_FILE.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_timings(timings):
+    TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    known = load_timings()
+    known.update(timings)
+    TIMINGS_FILE.write_text(json.dumps(known, indent=4, sort_keys=True))
+
+
+def order_slowest_first(scenes, timings):
+    def sort_key(entry):
+        module_name, scene_name = entry
+        if f"{module_name}.{scene_name}" in timings:
+            return (0, -timings[f"{module_name}.{scene_name}"])
+        if scene_name in SLOW_SCENES:
+            return (1, SLOW_SCENES.index(scene_name))
+        return (2, 0)
+
+    return sorted(scenes, key=sort_key)
+
+
+def scene_config(module_name, quality, extra_config=None):
+    module = importlib.import_module(module_name)
+    options = {
+        "input_file": Path(module.__file__),
+        "quality": QUALITY_FLAGS.get(quality, quality),
+        "save_sections": True,
+        "progress_bar": "none",
+    }
+    options.update(extra_config or {})
+    return options
+
+
+def quality_resolution(quality):
+    """``(pixel_width, pixel_height)`` of a quality flag or name."""
+    values = QUALITIES[QUALITY_FLAGS.get(quality, quality)]
+    return values["pixel_width"], values["pixel_height"]
+
+
+def render_scene(module_name, scene_name, quality="l", extra_config=None, profile=False,
+                 draft=False, slides=False, extra_qualities=(), frame_queue_depth=4,
+                 raster_threads=None, shard=None, dry_run=False):
+    """Worker entry point: render one scene and return its wall-clock time.
+
+    With ``profile``, a per-section breakdown is saved with
+    :func:`deck.profiler.save_report`. With ``draft``, only the last frame of
+    each section is rendered (see :mod:`deck.draft`). With ``slides``, the
+    section videos are also joined into one indexed movie (see
+    :mod:`deck.slides`). With ``extra_qualities``, the scene is also written
+    at the resolutions of those qualities from the same evaluation (see
+    :mod:`deck.resolutions`), rasterized on ``raster_threads`` worker threads.
+    ``frame_queue_depth`` frames may wait for the encoder (see
+    :mod:`deck.pipeline`). With ``shard``, ``(index, count)``, only that
+    share of the sections is rendered and no videos are joined. With
+    ``dry_run``, nothing is rasterized or encoded; the report of
+    :mod:`deck.dryrun` is saved instead, and :class:`~deck.dryrun.DryRunError`
+    raised if it found mistakes.
+    """
+    start = time.perf_counter()
+    run_scene(module_name, scene_name, quality, extra_config, profile, draft, slides,
+              extra_qualities, frame_queue_depth, raster_threads, shard, dry_run)
+    return time.perf_counter() - start
+
+
+def run_scene(module_name, scene_name, quality="l", extra_config=None, profile=False,
+              draft=False, slides=False, extra_qualities=(), frame_queue_depth=4,
+              raster_threads=None, shard=None, dry_run=False):
+    """Render one scene in this process, as :func:`render_scene`; returns the scene."""
+    module = importlib.import_module(module_name)
+    scene_class = getattr(module, scene_name)
+    key = f"{module_name}.{scene_name}"
+    report = report_key(key, shard)
+    if dry_run:
+        # a scene that fails must not leave the previous run's report behind
+        dryrun.report_path(key).unlink(missing_ok=True)
+        options = dict(DRY_RUN_CONFIG, **(extra_config or {}))
+        renderer_class, renderer_options = DryRunRenderer, {}
+    elif draft:
+        options = dict(DRAFT_CONFIG, **(extra_config or {}))
+        renderer_class, renderer_options = DraftRenderer, {}
+    else:
+        options = extra_config
+        renderer_class, renderer_options = DeckRenderer, {
+            "slides": slides, "frame_queue_depth": frame_queue_depth, "shard": shard,
+        }
+    resolutions = [
+        resolution for resolution in dict.fromkeys(map(quality_resolution, extra_qualities))
+        if resolution != quality_resolution(quality)
+    ]
+    if resolutions and renderer_class is DeckRenderer:
+        renderer_class = MultiResolutionRenderer
+        renderer_options["resolutions"] = resolutions
+        renderer_options["raster_threads"] = raster_threads
+    with tempconfig(scene_config(module_name, quality, options)):
+        tex_cache.take_requested()
+        with profiler.profiling(report) if profile else nullcontext() as scene_profile:
+            # the camera reads the quality from config, so build it in here
+            renderer = make_renderer(scene_class, renderer_class, **renderer_options)
+            scene = scene_class(renderer=renderer)
+            scene.render()
+        requested = tex_cache.take_requested()
+        if shard is None:
+            # the shards ask for the same expressions as the joining render
+            tex_batch.save_manifest(key, requested)
+    if profile:
+        profiler.save_report(report, scene_profile.report())
+    if dry_run:
+        dry_report = renderer.report()
+        dryrun.save_report(key, dry_report)
+        if dry_report["problems"]:
+            raise DryRunError(f"{dry_report['problems']} problem(s) in {key}")
+    return scene
+
+
+def report_key(key, shard=None):
+    return key if shard is None else f"{key}.shard{shard[0]}"
+
+
+def render_deck(module_names=CHAPTER_MODULES, scene_names=None, quality="l",
+                workers=None, extra_config=None, profile=False, draft=False, slides=False,
+                tex_batch_compile=True, extra_qualities=(), frame_queue_depth=4,
+                raster_threads=None, shards=1, dry_run=False):
+    scenes = discover_scenes(module_names)
+    if scene_names:
+        scenes = [entry for entry in scenes if entry[1] in scene_names]
+    scenes = order_slowest_first(scenes, load_timings())
+    workers = workers or os.cpu_count() or 1
+    # shards find each other's sections through the play hashes
+    if draft or dry_run or (extra_config or {}).get("disable_caching"):
+        shards = 1
+
+    results = {}
+    failures = {}
+    reports = []
+    start = time.perf_counter()
+    if tex_batch_compile:
+        # one latex run for the whole deck instead of one per formula per worker
+        with tempconfig(extra_config or {}):
+            tex_batch.precompile_scenes(scenes)
+    with ProcessPoolExecutor(max_workers=min(workers, len(scenes) * shards or 1)) as pool:
+        futures = {}
+
+        def submit(module_name, scene_name, shard=None):
+            future = pool.submit(render_scene, module_name, scene_name, quality, extra_config,
+                                 profile, draft, slides, extra_qualities, frame_queue_depth,
+                                 raster_threads, shard, dry_run)
+            futures[future] = (module_name, scene_name, shard)
+
+        # shards still running, and when the first one started, per scene
+        running = {}
+        started = {}
+        for module_name, scene_name in scenes:
+            if shards > 1:
+                running[f"{module_name}.{scene_name}"] = shards
+                for index in range(shards):
+                    submit(module_name, scene_name, (index, shards))
+            else:
+                submit(module_name, scene_name)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                module_name, scene_name, shard = futures.pop(future)
+                key = f"{module_name}.{scene_name}"
+                if key in failures:
+                    continue
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    failures[key] = repr(e)
+                    results.pop(key, None)
+                    continue
+                reports.append(report_key(key, shard))
+                now = time.perf_counter()
+                if shard is not None:
+                    # the shard started about ``seconds`` before it came back
+                    started[key] = min(started.get(key, now - seconds), now - seconds)
+                    running[key] -= 1
+                    if not running[key]:
+                        submit(module_name, scene_name)
+                elif key in started:
+                    # wall time from the first shard starting to the end of the join
+                    results[key] = now - started[key]
+                else:
+                    results[key] = seconds
+    total = time.perf_counter() - start
+
+    if not (draft or dry_run):
+        # their times would put the wrong scenes first in the next full run
+        save_timings(results)
+    if profile:
+        for key in sorted(reports):
+            if key.partition(".shard")[0] in results:
+                profiler.print_report(profiler.load_report(key))
+    if dry_run:
+        for module_name, scene_name in scenes:
+            key = f"{module_name}.{scene_name}"
+            if dryrun.report_path(key).exists() and (key in results or key in failures):
+                dryrun.print_report(dryrun.load_report(key))
+    print_summary(results, failures, total)
+    return results, failures
+
+
+def print_summary(results, failures, total):
+    rows = sorted(results.items(), key=lambda item: -item[1])
+    width = max([len(key) for key in list(results) + list(failures)] + [5])
+    print(f"\n{'Scene':<{width}}  {'Wall (s)':>9}")
+    print("-" * (width + 11))
+    for key, seconds in rows:
+        print(f"{key:<{width}}  {seconds:>9.1f}")
+    for key, error in failures.items():
+        print(f"{key:<{width}}  {'FAILED':>9}  {error}")
+    print("-" * (width + 11))
+    busy = sum(results.values())
+    print(f"{'Deck wall clock':<{width}}  {total:>9.1f}")
+    print(f"{'Sum of scenes':<{width}}  {busy:>9.1f}")
@@ -0,0 +1,53 @@
+"""Fingerprints and a cross-run cache for finished section videos.
+
+manim hashes every ``play``/``wait`` call from the scene state, the camera
+and the animations involved, and names the partial movie after that hash.
+The first hash of a section therefore already covers the state at the
+section start, so a section is identified by its name and the ordered
+hashes of the calls played in it. If none of them changed, the combined
+section video from an earlier run is reused as is.
+"""
+
+from pathlib import Path
+
+from .store import DiskStore, content_hash
+
+
+def play_hashes(section):
+    return [Path(path).stem for path in section.get_clean_partial_movie_files()]
+
+
+def section_fingerprint(section):
+    hashes = play_hashes(section)
+    # --disable_caching names partial movies by index, which says nothing
+    # about their content
+    if not hashes or any(h.startswith("uncached_") for h in hashes):
+        return None
+    return content_hash(section.type, section.name, *hashes)
+
+
+class SectionCache:
+    def __init__(self, root=None, max_megabytes=2048, suffix=".mp4"):
+        self.sections = DiskStore(
+            "sections", root=root, max_bytes=max_megabytes * 1024 * 1024, suffix=suffix
+        )
+        # partial movies outlive manim's max_files_cached cleanup here
+        self.partials = DiskStore(
+            "partials", root=root, max_bytes=max_megabytes * 1024 * 1024, suffix=suffix
+        )
+
+    def fetch_partial(self, play_hash, destination):
+        return self.partials.fetch(play_hash, destination)
+
+    def store_partial(self, play_hash, source):
+        if not play_hash.startswith("uncached_"):
+            self.partials.put_file(play_hash, source)
+
+    def fetch_section(self, section, destination):
+        fingerprint = section_fingerprint(section)
+        return fingerprint is not None and self.sections.fetch(fingerprint, destination)
+
+    def store_section(self, section, source):
+        fingerprint = section_fingerprint(section)
+        if fingerprint is not None:
+            self.sections.put_file(fingerprint, source)
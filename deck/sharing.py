@@ -0,0 +1,58 @@
+"""Copies of planes that share their point arrays until one of them moves.
+
+``grid.copy().set_opacity(0.5).set_color(GREY)`` deep-copies every array of
+the grid although only the style of the copy changes. The planes in
+:mod:`deck.grid` instead hand their copies the arrays of the original and
+mark them read-only, so a style-only copy costs its colours and nothing
+else. Whichever side is moved afterwards gets arrays of its own.
+
+manim replaces ``points`` with a new array whenever it moves a mobject,
+except in ``Mobject.apply_points_function_about_point`` (rotate, scale,
+stretch, apply_function, ...), which moves the points to the pivot and back
+in place. ``install()`` makes that allocate as well; until it is called,
+:class:`~deck.grid.CompactPlane` copies its lines as before. The arrays of
+a :class:`~deck.grid.ViewportPlane` are never written in place and are
+always shared.
+"""
+
+import numpy as np
+from manim import ORIGIN, Mobject
+
+_installed = False
+
+
+def share_arrays(clone_from_id, *arrays):
+    """Make a deepcopy in progress reuse ``arrays`` instead of copying them."""
+    for array in arrays:
+        if not isinstance(array, np.ndarray):
+            continue
+        # so a stray in-place edit fails instead of moving every copy
+        array.flags.writeable = False
+        clone_from_id.setdefault(id(array), array)
+
+
+def share_points(mobject, clone_from_id):
+    """Share the points of ``mobject`` with its copy, if that is safe."""
+    points = mobject.__dict__.get("points")
+    # points bound to an animation buffer (deck.transforms) are a view and
+    # keep moving, so the copy gets a snapshot of them
+    if _installed and isinstance(points, np.ndarray) and points.flags.owndata:
+        share_arrays(clone_from_id, points)
+
+
+def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+    # as Mobject's, but never writes into points, which may be shared
+    if about_point is None:
+        if about_edge is None:
+            about_edge = ORIGIN
+        about_point = self.get_critical_point(about_edge)
+    for mob in self.family_members_with_points():
+        mob.points = func(mob.points - about_point) + about_point
+    return self
+
+
+def install():
+    """Let copies of CompactPlane lines share their points."""
+    global _installed
+    Mobject.apply_points_function_about_point = apply_points_function_about_point
+    _installed = True
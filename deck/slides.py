@@ -0,0 +1,100 @@
+"""One seekable movie per scene for presenting section by section.
+
+:func:`write_slides` joins the section videos of a scene into a single
+fragmented MP4 (one fragment per keyframe, and every section starts on a
+keyframe) and writes a JSON index next to it::
+
+    {
+        "video": "VisualizingTransformations_slides.mp4",
+        "init_size": 1143,
+        "sections": [
+            {"name": "...", "start": 12.4, "duration": 6.0,
+             "byte_offset": 48213, "byte_length": 91024,
+             "keyframes": [12.4, 16.4]},
+            ...
+        ]
+    }
+
+``byte_offset`` is the ``moof`` box the section starts at, so a player that
+has parsed the first ``init_size`` bytes (``ftyp`` + ``moov``) can hand the
+bytes ``[byte_offset, byte_offset + byte_length)`` straight to its decoder.
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+from manim import __version__, config
+
+from .mp4 import read_fragments
+
+
+def write_slides(sections, sections_dir, output_name):
+    """Join ``sections`` (dicts from ``Section.get_dict``) into ``<output_name>_slides.mp4``.
+
+    Returns the path of the JSON index.
+    """
+    sections_dir = Path(sections_dir)
+    movie_path = sections_dir / f"{output_name}_slides.mp4"
+    file_list = sections_dir / f"{output_name}_slides.txt"
+    with file_list.open("w", encoding="utf-8") as file:
+        for section in sections:
+            file.write(f"file 'file:{(sections_dir / section['video']).as_posix()}'\n")
+    command = [
+        config.ffmpeg_executable,
+        "-y",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(file_list),
+        "-loglevel", config.ffmpeg_loglevel.lower(),
+        "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+        "-nostdin",
+        "-c", "copy",
+        "-an",
+        # a fragment starts at every keyframe, so at every section
+        "-movflags", "+frag_keyframe+empty_moov+default_base_moof",
+        str(movie_path),
+    ]
+    subprocess.run(command, check=True)
+    file_list.unlink()
+
+    init_size, _, fragments = read_fragments(movie_path)
+    # fragments are stamped with decode times, which lead presentation
+    # times by the B-frame delay; the first frame is presented at 0
+    lead = fragments[0][1]
+    fragments = [(offset, time - lead) for offset, time in fragments]
+    total_size = movie_path.stat().st_size
+    frame_time = 1 / config.frame_rate
+
+    entries = []
+    start = 0.0
+    for section in sections:
+        duration = float(section["duration"])
+        first = min(range(len(fragments)), key=lambda i: abs(fragments[i][1] - start))
+        entries.append({
+            "name": section["name"],
+            "type": section["type"],
+            "start": start,
+            "duration": duration,
+            "byte_offset": fragments[first][0],
+            "first_fragment": first,
+        })
+        start += duration
+
+    for index, entry in enumerate(entries):
+        last = entries[index + 1]["first_fragment"] if index + 1 < len(entries) else len(fragments)
+        end = fragments[last][0] if last < len(fragments) else total_size
+        entry["byte_length"] = end - entry["byte_offset"]
+        entry["keyframes"] = [
+            round(time, 6)
+            for _, time in fragments[entry.pop("first_fragment"):last]
+            if time < entry["start"] + entry["duration"] - frame_time / 2
+        ]
+
+    index_path = sections_dir / f"{output_name}_slides.json"
+    index_path.write_text(json.dumps({
+        "video": movie_path.name,
+        "init_size": init_size,
+        "sections": entries,
+    }, indent=4))
+    return index_path
@@ -0,0 +1,153 @@
+"""Content-addressed on-disk store shared by every render process.
+
+Entries are written to a temporary file in the store and moved into place
+with ``os.replace``, so concurrent writers never expose a half-written file
+and the last writer of a key simply wins. Reading an entry bumps its mtime,
+which is what the size-bounded LRU eviction sorts on. Each process keeps a
+running estimate of the store's size and only scans it when that estimate
+goes over the limit, or once it has written a tenth of the limit since its
+last scan to catch up with the other writers.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("DECK_CACHE_DIR", "media/deck_cache"))
+
+
+def content_hash(*parts):
+    hasher = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        hasher.update(part)
+        # separator so ("ab", "c") and ("a", "bc") don't collide
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+class DiskStore:
+    def __init__(self, namespace, root=None, max_bytes=256 * 1024 * 1024, suffix=""):
+        self.root = Path(root or DEFAULT_CACHE_DIR) / namespace
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        # size as of the last scan plus what we put since; None until the
+        # first put scans the store
+        self.size = None
+        self.written = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key):
+        # two-level fan-out keeps directories small on shared filesystems
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key):
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def read_bytes(self, key):
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # evicted by another process between utime and read
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+    def fetch(self, key, destination):
+        """Copy the entry for ``key`` to ``destination``; return whether it existed."""
+        path = self.get(key)
+        if path is None:
+            return False
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._atomic_copy(path, destination)
+        except FileNotFoundError:
+            self.hits -= 1
+            self.misses += 1
+            return False
+        return True
+
+    def put_bytes(self, key, data):
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._added(len(data))
+        return path
+
+    def put_file(self, key, source):
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_copy(Path(source), path)
+        self._added(path.stat().st_size)
+        return path
+
+    def _added(self, size):
+        if self.size is not None:
+            self.size += size
+            self.written += size
+            if self.size <= self.max_bytes and self.written <= self.max_bytes / 10:
+                return
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the store fits in ``max_bytes``."""
+        self.written = 0
+        entries = []
+        total = 0
+        for path in self.root.glob(f"*/*{self.suffix}"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        self.size = total
+        if total <= self.max_bytes:
+            return
+        # evict down to 90% so the next puts fit without a rescan
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self.size = total
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _atomic_copy(source, destination):
+        fd, tmp = tempfile.mkstemp(dir=destination.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, destination)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
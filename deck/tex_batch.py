@@ -0,0 +1,178 @@
+"""Compile the LaTeX a render will need up front, as one document.
+
+Every ``MathTex`` otherwise runs its own ``latex`` and ``dvisvgm`` when it is
+created. :func:`precompile` typesets any number of expressions as the pages
+of a single document (one ``latex`` and one ``dvisvgm`` run) and files each
+page under the name :mod:`deck.tex_cache` looks up, so the scenes then find
+every formula already compiled.
+
+What a scene needs comes from two places: the string literals passed to
+``MathTex``/``Tex`` in the chapter source, and a manifest of every
+expression the scene asked for the last time it was rendered (which also
+covers strings built at run time, like matrix entries and coordinates).
+"""
+
+import ast
+import importlib
+import inspect
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from manim import TexTemplate, config, logger
+from manim.utils import tex_file_writing
+from manim.utils.tex import _texcode_for_environment
+
+from . import dvisvgm, tex_cache
+from .store import DEFAULT_CACHE_DIR
+
+MANIFEST_DIR = DEFAULT_CACHE_DIR / "tex_manifests"
+
+# constructor -> (tex_environment, arg_separator) defaults
+TEX_CLASSES = {
+    "MathTex": ("align*", " "),
+    "Tex": ("center", ""),
+}
+# keywords that change how the strings are split or typeset
+UNSUPPORTED_KEYWORDS = {
+    "tex_environment", "tex_template", "arg_separator",
+    "substrings_to_isolate", "tex_to_color_map",
+}
+
+
+def _split(tex_strings):
+    # MathTex._break_up_tex_strings without isolated substrings
+    pieces = sum((re.split("{{(.*?)}}", string) for string in tex_strings), [])
+    return [piece for piece in pieces if piece]
+
+
+def literal_expressions(module_name):
+    """``(expression, environment)`` for the literal MathTex/Tex calls in a module."""
+    tree = ast.parse(inspect.getsource(importlib.import_module(module_name)))
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = getattr(node.func, "id", getattr(node.func, "attr", None))
+        if name not in TEX_CLASSES or not node.args:
+            continue
+        if any(keyword.arg in UNSUPPORTED_KEYWORDS for keyword in node.keywords):
+            continue
+        if not all(isinstance(arg, ast.Constant) and isinstance(arg.value, str) for arg in node.args):
+            continue
+        environment, separator = TEX_CLASSES[name]
+        pieces = _split([arg.value for arg in node.args])
+        # MathTex compiles the joined string, then every piece on its own
+        for expression in [separator.join(pieces)] + pieces:
+            found.append((expression, environment))
+    return found
+
+
+def manifest_path(scene_key):
+    return MANIFEST_DIR / f"{scene_key}.json"
+
+
+def save_manifest(scene_key, expressions):
+    path = manifest_path(scene_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(sorted(set(expressions), key=repr), indent=4))
+
+
+def load_manifest(scene_key):
+    try:
+        return [tuple(entry) for entry in json.loads(manifest_path(scene_key).read_text())]
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def supports_batching(tex_template):
+    # pages are split with the preview package, which the default
+    # standalone class uses the same way for a single formula
+    return not tex_template._body and tex_template.documentclass == TexTemplate.documentclass
+
+
+def batch_document(expressions, tex_template):
+    pages = []
+    for expression, environment in expressions:
+        if environment is not None:
+            begin, end = _texcode_for_environment(environment)
+            expression = "\n".join([begin, expression, end])
+        pages.append("\\begin{preview}\n" + expression + "\n\\end{preview}")
+    return "\n".join(filter(None, [
+        r"\documentclass{article}",
+        r"\usepackage[active,tightpage]{preview}",
+        tex_template.preamble,
+        r"\begin{document}",
+        tex_template.post_doc_commands,
+        *pages,
+        r"\end{document}",
+    ]))
+
+
+def precompile(expressions, tex_template=None):
+    """Compile the ``(expression, environment)`` pairs not cached yet.
+
+    Returns how many were compiled. If the batch fails for any reason the
+    formulas are left to the normal one-at-a-time path.
+    """
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    if not supports_batching(tex_template):
+        return 0
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    store = tex_cache.get_store()
+
+    missing = {}
+    for expression, environment in dict.fromkeys(expressions):
+        source = tex_cache.tex_source(expression, environment, tex_template)
+        local_svg = tex_dir / f"{tex_file_writing.tex_hash(source)}.svg"
+        if local_svg.exists():
+            continue
+        if store is not None and store.fetch(tex_cache.tex_cache_key(source, tex_template), local_svg):
+            continue
+        missing[(expression, environment)] = (source, local_svg)
+    if not missing:
+        return 0
+
+    logger.info(f"Compiling {len(missing)} LaTeX expressions in one batch")
+    with tempfile.TemporaryDirectory(dir=tex_dir) as build_dir:
+        build_dir = Path(build_dir)
+        tex_file = build_dir / "batch.tex"
+        tex_file.write_text(batch_document(missing, tex_template), encoding="utf-8")
+        command = tex_file_writing.tex_compilation_command(
+            tex_template.tex_compiler, tex_template.output_format, tex_file, build_dir
+        )
+        if os.system(command) != 0:
+            # the offending formula fails again, with manim's error report,
+            # when the scene compiles it on its own
+            logger.warning("Batch LaTeX compile failed, compiling formulas one at a time")
+            return 0
+        pages = dvisvgm.convert_pages(
+            tex_file.with_suffix(tex_template.output_format),
+            build_dir,
+            pdf=tex_template.output_format == ".pdf",
+        )
+        try:
+            assigned = dvisvgm.assign_pages(missing.values(), pages)
+        except ValueError as e:
+            logger.warning(f"Batch LaTeX compile failed ({e}), compiling formulas one at a time")
+            return 0
+        for (source, local_svg), page in assigned:
+            shutil.move(page, local_svg)
+            if store is not None:
+                store.put_file(tex_cache.tex_cache_key(source, tex_template), local_svg)
+    return len(missing)
+
+
+def precompile_scenes(scenes):
+    """Batch-compile what the ``(module_name, scene_name)`` entries need."""
+    expressions = []
+    for module_name in dict.fromkeys(module_name for module_name, _ in scenes):
+        expressions += literal_expressions(module_name)
+    for module_name, scene_name in scenes:
+        expressions += load_manifest(f"{module_name}.{scene_name}")
+    return precompile(expressions)
@@ -0,0 +1,90 @@
+"""Persistent LaTeX cache shared by every process rendering the deck.
+
+manim already skips latex/dvisvgm when ``media/Tex/<hash>.svg`` exists, but
+that directory is per checkout and per worker. ``install()`` wraps
+``tex_to_svg_file`` so a compiled SVG is published to a shared
+:class:`~deck.store.DiskStore` and copied back into the local Tex dir by any
+other process that asks for the same expression.
+"""
+
+import os
+
+from manim import config
+from manim.mobject.text import tex_mobject
+from manim.utils import tex_file_writing
+
+from .store import DiskStore, content_hash
+
+_original_tex_to_svg_file = tex_file_writing.tex_to_svg_file
+_store = None
+# keys this process knows to be in the shared store
+_published = set()
+# (expression, environment) asked for with the default template, for
+# deck.tex_batch manifests
+_requested = []
+
+
+def tex_source(expression, environment, tex_template):
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+def tex_cache_key(source, tex_template):
+    # Color and scale are applied to the parsed SVGMobject, not to the SVG,
+    # so the full LaTeX source plus the compiler settings identify the file.
+    return content_hash(source, tex_template.tex_compiler, tex_template.output_format)
+
+
+def cached_tex_to_svg_file(expression, environment=None, tex_template=None):
+    if tex_template is None:
+        tex_template = config["tex_template"]
+    if tex_template is config["tex_template"]:
+        _requested.append((expression, environment))
+    source = tex_source(expression, environment, tex_template)
+    key = tex_cache_key(source, tex_template)
+    # same name manim's own tex_to_svg_file would use, so both find it
+    local_svg = config.get_dir("tex_dir") / f"{tex_file_writing.tex_hash(source)}.svg"
+    if local_svg.exists():
+        # compiled here before the store existed, or by a plain manim run:
+        # publish it so other workers don't compile it again
+        if _store is not None and key not in _published:
+            if not _store.path_for(key).exists():
+                _store.put_file(key, local_svg)
+            _published.add(key)
+        return local_svg
+    if _store is not None and _store.fetch(key, local_svg):
+        return local_svg
+
+    svg_file = _original_tex_to_svg_file(
+        expression, environment=environment, tex_template=tex_template
+    )
+    if _store is not None:
+        _store.put_file(key, svg_file)
+        _published.add(key)
+    return svg_file
+
+
+def get_store():
+    return _store
+
+
+def take_requested():
+    """The expressions asked for since the last call."""
+    requested = list(_requested)
+    _requested.clear()
+    return requested
+
+
+def install(root=None, max_megabytes=None):
+    """Route every Tex/MathTex compile through the shared cache."""
+    global _store
+    if max_megabytes is None:
+        max_megabytes = float(os.environ.get("DECK_TEX_CACHE_MB", 256))
+    _store = DiskStore(
+        "tex", root=root, max_bytes=int(max_megabytes * 1024 * 1024), suffix=".svg"
+    )
+    tex_file_writing.tex_to_svg_file = cached_tex_to_svg_file
+    # tex_mobject binds the name at import time
+    tex_mobject.tex_to_svg_file = cached_tex_to_svg_file
+    return _store
@@ -0,0 +1,160 @@
+"""Persistent caches for ``Text`` and ``MarkupText``, shared by every process.
+
+Building a Text runs Pango to lay the string out as an SVG, then parses
+that SVG into one VMobject per glyph outline. manim skips Pango when
+``media/texts/<hash>.svg`` exists, but that directory is per checkout and
+the parsing is repeated every time. ``install()`` adds two caches:
+
+* layouts: the Pango SVG of every string, published to a shared
+  :class:`~deck.store.DiskStore` under manim's own hash of the string, font,
+  weight, slant, size and colours, like :mod:`deck.tex_cache` does for LaTeX.
+* outlines: the points and style of every glyph outline parsed from an SVG,
+  keyed by the SVG's contents and saved as ``.npz``. A hit builds the
+  outlines straight from the arrays, without parsing XML or path data.
+
+Hits and misses of both are counted (:func:`stats`) and reported by
+:mod:`deck.profiler`.
+"""
+
+import io
+import os
+
+import numpy as np
+from manim import MarkupText, Text, VMobject, config
+
+from .store import DiskStore, content_hash
+
+_original_text2svg = {cls: cls.__dict__["_text2svg"] for cls in (Text, MarkupText)}
+_original_generate_mobject = Text.generate_mobject
+_layouts = None
+_outlines = None
+# layout keys this process knows to be in the shared store
+_published = set()
+# outline arrays loaded by this process, by key
+_loaded = {}
+_stats = {
+    "layouts": {"hits": 0, "misses": 0},
+    "outlines": {"hits": 0, "misses": 0},
+}
+
+
+def _count(cache, hit):
+    _stats[cache]["hits" if hit else "misses"] += 1
+
+
+def cached_text2svg(self, color):
+    cls = Text if isinstance(self, Text) else MarkupText
+    hash_name = self._text2hash(color)
+    # same name manim's own _text2svg would use, so both find it
+    local_svg = config.get_dir("text_dir") / f"{hash_name}.svg"
+    key = content_hash(cls.__name__, hash_name)
+    if local_svg.exists():
+        _count("layouts", True)
+        # laid out by a plain manim run: publish it for the other workers
+        if _layouts is not None and key not in _published:
+            if not _layouts.path_for(key).exists():
+                _layouts.put_file(key, local_svg)
+            _published.add(key)
+        return str(local_svg.resolve())
+    if _layouts is not None and _layouts.fetch(key, local_svg):
+        _count("layouts", True)
+        _published.add(key)
+        return str(local_svg.resolve())
+
+    _count("layouts", False)
+    svg_file = _original_text2svg[cls](self, color)
+    if _layouts is not None:
+        _layouts.put_file(key, svg_file)
+        _published.add(key)
+    return svg_file
+
+
+def outline_key(mobject):
+    # generate_mobject only depends on the file and the default style
+    return content_hash(
+        mobject.get_file_path().read_bytes(),
+        repr(sorted(mobject.svg_default.items())),
+        repr(sorted(mobject.path_string_config.items())),
+        str(config.renderer),
+    )
+
+
+def save_outlines(mobjects):
+    """The points and style of ``mobjects`` as arrays."""
+    return {
+        "points": np.vstack([mob.points for mob in mobjects]) if mobjects else np.zeros((0, 3)),
+        "lengths": np.array([len(mob.points) for mob in mobjects], dtype=int),
+        "stroke_width": np.array([mob.get_stroke_width() for mob in mobjects], dtype=float),
+        "stroke_color": np.array([mob.get_stroke_color().to_hex() for mob in mobjects], dtype="U9"),
+        "stroke_opacity": np.array([mob.get_stroke_opacity() for mob in mobjects], dtype=float),
+        "fill_color": np.array([mob.get_fill_color().to_hex() for mob in mobjects], dtype="U9"),
+        "fill_opacity": np.array([mob.get_fill_opacity() for mob in mobjects], dtype=float),
+    }
+
+
+def load_outlines(arrays):
+    """VMobjects with the points and style saved by :func:`save_outlines`."""
+    mobjects = []
+    ends = np.cumsum(arrays["lengths"])
+    for index, (start, end) in enumerate(zip(ends - arrays["lengths"], ends)):
+        mob = VMobject()
+        mob.set_points(arrays["points"][start:end])
+        # as SVGMobject.apply_style_to_mobject
+        mob.set_style(
+            stroke_width=float(arrays["stroke_width"][index]),
+            stroke_color=str(arrays["stroke_color"][index]),
+            stroke_opacity=float(arrays["stroke_opacity"][index]),
+            fill_color=str(arrays["fill_color"][index]),
+            fill_opacity=float(arrays["fill_opacity"][index]),
+        )
+        mobjects.append(mob)
+    return mobjects
+
+
+def _fetch_outlines(key):
+    if key in _loaded:
+        return _loaded[key]
+    data = _outlines.read_bytes(key) if _outlines is not None else None
+    if data is None:
+        return None
+    with np.load(io.BytesIO(data)) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    _loaded[key] = arrays
+    return arrays
+
+
+def cached_generate_mobject(self):
+    key = outline_key(self)
+    arrays = _fetch_outlines(key)
+    if arrays is not None:
+        _count("outlines", True)
+        # saved after SVGMobject flipped them, so they are in place
+        self.add(*load_outlines(arrays))
+        return
+
+    _count("outlines", False)
+    _original_generate_mobject(self)
+    arrays = save_outlines(self.submobjects)
+    _loaded[key] = arrays
+    if _outlines is not None:
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        _outlines.put_bytes(key, buffer.getvalue())
+
+
+def stats():
+    """Hits and misses of both caches since the process started."""
+    return {cache: dict(counts) for cache, counts in _stats.items()}
+
+
+def install(root=None, max_megabytes=None):
+    """Route every Text/MarkupText layout and outline through the shared caches."""
+    global _layouts, _outlines
+    if max_megabytes is None:
+        max_megabytes = float(os.environ.get("DECK_TEXT_CACHE_MB", 64))
+    max_bytes = int(max_megabytes * 1024 * 1024)
+    _layouts = DiskStore("text", root=root, max_bytes=max_bytes, suffix=".svg")
+    _outlines = DiskStore("outlines", root=root, max_bytes=max_bytes, suffix=".npz")
+    for cls in (Text, MarkupText):
+        cls._text2svg = cached_text2svg
+        cls.generate_mobject = cached_generate_mobject
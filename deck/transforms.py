@@ -0,0 +1,210 @@
+"""Animations that move the points of many mobjects as one array.
+
+``ApplyMatrix(m, grid), ApplyMatrix(m, i_hat), ...`` copies and aligns every
+target, then interpolates each submobject separately on every frame. The
+animations here gather the points of all targets into one contiguous buffer
+when they begin and point each submobject's ``points`` at its slice of that
+buffer, so a frame is a single NumPy operation over the buffer no matter how
+many mobjects take part.
+"""
+
+import numpy as np
+from manim import ORIGIN, Animation, Group, VMobject
+from manim.constants import DEFAULT_POINTWISE_FUNCTION_RUN_TIME
+
+from .grid import LatticeLines
+
+
+def _buffer_attribute(mobject):
+    # a ViewportPlane is moved through its basis; its points are derived
+    return "_basis" if isinstance(mobject, LatticeLines) else "points"
+
+
+class _StackedPointsAnimation(Animation):
+    def __init__(self, *mobjects, run_time=DEFAULT_POINTWISE_FUNCTION_RUN_TIME, **kwargs):
+        self.targets = list(mobjects)
+        # introducer=True keeps Scene.add_mobjects_from_animations from adding
+        # the helper Group itself, which would pull every target to the front
+        super().__init__(Group(*mobjects), run_time=run_time, introducer=True, **kwargs)
+
+    def _setup_scene(self, scene):
+        if scene is None:
+            return
+        family = scene.get_mobject_family_members()
+        missing = [mob for mob in self.targets if mob not in family]
+        if missing:
+            scene.add(*missing)
+            family = scene.get_mobject_family_members()
+        # Scene.get_moving_mobjects only looks at ``animation.mobject`` and
+        # treats everything drawn after it as moving, so point it at the
+        # lowest of the targets
+        self.mobject = min(self.targets, key=family.index)
+
+    def begin(self):
+        if self.run_time <= 0:
+            raise ValueError(
+                f"{self} has a run_time of <= 0 seconds, this cannot be rendered correctly. "
+                "Please set the run_time to be positive"
+            )
+        self.slices = []
+        arrays = []
+        seen = set()
+        offset = 0
+        for target in self.targets:
+            for mob in target.family_members_with_points():
+                if id(mob) in seen:
+                    continue
+                seen.add(id(mob))
+                attribute = _buffer_attribute(mob)
+                array = np.asarray(getattr(mob, attribute), dtype=float)
+                arrays.append(array)
+                self.slices.append((mob, attribute, slice(offset, offset + len(array))))
+                offset += len(array)
+        self.start_points = np.vstack(arrays) if arrays else np.zeros((0, 3))
+        self.buffer = self.start_points.copy()
+        self.bind_buffer()
+        self.prepare()
+        for target in self.targets:
+            target.suspend_updating()
+        self.interpolate(0)
+
+    def bind_buffer(self):
+        for mob, attribute, span in self.slices:
+            # a view, so writing the buffer moves the mobject
+            mob.__dict__[attribute] = self.buffer[span]
+
+    def prepare(self):
+        """Called once the buffer is bound, before the first frame."""
+
+    def finish(self):
+        self.interpolate(1)
+        # detach from the shared buffer so later edits stay local
+        for mob, attribute, span in self.slices:
+            mob.__dict__[attribute] = self.buffer[span].copy()
+        for target in self.targets:
+            target.resume_updating()
+
+    def interpolate_mobject(self, alpha):
+        if self.reverse_rate_function:
+            alpha = 1 - alpha
+        self.interpolate_buffer(self.rate_func(alpha))
+
+    def interpolate_buffer(self, alpha):
+        raise NotImplementedError
+
+    def get_all_mobjects(self):
+        return self.targets
+
+    def get_all_mobjects_to_update(self):
+        # the scene updates the targets themselves
+        return []
+
+
+class TransformSpace(_StackedPointsAnimation):
+    """Apply ``matrix`` to all of ``mobjects`` at once, like one ``ApplyMatrix`` each.
+
+    Example::
+
+        self.play(TransformSpace(shear_matrix, grid, i_hat, j_hat))
+    """
+
+    def __init__(self, matrix, *mobjects, about_point=ORIGIN, **kwargs):
+        self.matrix = self.initialize_matrix(matrix)
+        self.about_point = np.array(about_point, dtype=float)
+        super().__init__(*mobjects, **kwargs)
+
+    @staticmethod
+    def initialize_matrix(matrix):
+        matrix = np.array(matrix, dtype=float)
+        if matrix.shape == (2, 2):
+            new_matrix = np.identity(3)
+            new_matrix[:2, :2] = matrix
+            matrix = new_matrix
+        elif matrix.shape != (3, 3):
+            raise ValueError("Matrix has bad dimensions")
+        return matrix
+
+    def interpolate_buffer(self, alpha):
+        # ApplyMatrix moves every point on a straight line from p to Mp, which
+        # is the blended linear map (1 - alpha) I + alpha M
+        blended = (1 - alpha) * np.identity(3) + alpha * self.matrix
+        np.matmul(self.start_points - self.about_point, blended.T, out=self.buffer)
+        self.buffer += self.about_point
+
+
+class ApplyPointsFunction(_StackedPointsAnimation):
+    """Vectorized ``mobject.animate.apply_function(function)`` for many mobjects.
+
+    ``function`` maps an ``(N, 3)`` array of points to an ``(N, 3)`` array and
+    is called once, on the stacked points of all targets, when the animation
+    begins. Handles are mapped the way ``VMobject.apply_function`` maps them
+    and targets with ``make_smooth_after_applying_functions`` set are
+    smoothed, so the end state matches ``apply_function`` exactly. Example::
+
+        def warp(points):
+            return points + 0.1 * points[:, [1]] ** 2 * RIGHT
+
+        self.play(ApplyPointsFunction(warp, grid, i_hat, j_hat, line))
+    """
+
+    def __init__(self, function, *mobjects, **kwargs):
+        self.function = function
+        super().__init__(*mobjects, **kwargs)
+
+    def prepare(self):
+        if any(attribute != "points" for _, attribute, _ in self.slices):
+            raise ValueError(
+                "ViewportPlane only supports affine transformations; "
+                "use CompactPlane for non-linear warps"
+            )
+        start = self.start_points
+        # VMobject.apply_function pulls handles towards their anchors before
+        # mapping and pushes them back out after, so they follow the
+        # function's derivative instead of being mapped as points
+        handles = []
+        anchors = []
+        factors = []
+        for mob, _, span in self.slices:
+            if not isinstance(mob, VMobject):
+                continue
+            index = np.arange(span.start, span.stop)
+            position = (index - span.start) % mob.n_points_per_cubic_curve
+            first = index[position == 1]
+            second = index[position == 2]
+            handles.extend([first, second])
+            anchors.extend([first - 1, second + 1])
+            factors.append(np.full(len(first) + len(second),
+                                   mob.pre_function_handle_to_anchor_scale_factor))
+        probe = start.copy()
+        if handles:
+            handles = np.concatenate(handles)
+            anchors = np.concatenate(anchors)
+            factors = np.concatenate(factors)[:, None]
+            probe[handles] = start[anchors] + factors * (start[handles] - start[anchors])
+        mapped = np.asarray(self.function(probe), dtype=float)
+        end = mapped.copy()
+        if len(handles):
+            end[handles] = mapped[anchors] + (mapped[handles] - mapped[anchors]) / factors
+
+        smoothed = [t for t in self.targets if getattr(t, "make_smooth_after_applying_functions", False)]
+        if smoothed:
+            # smoothing is per subpath and happens once, not per frame
+            self.buffer[:] = end
+            for target in smoothed:
+                target.make_smooth()
+            end = np.vstack([getattr(mob, attribute) for mob, attribute, _ in self.slices])
+            self.bind_buffer()
+        self.end_points = end
+        self.delta = end - start
+
+    def interpolate_buffer(self, alpha):
+        np.multiply(self.delta, alpha, out=self.buffer)
+        self.buffer += self.start_points
+
+
+def apply_points_function(function, *mobjects):
+    """Instant form of :class:`ApplyPointsFunction`."""
+    animation = ApplyPointsFunction(function, *mobjects)
+    animation.begin()
+    animation.finish()
+    return mobjects
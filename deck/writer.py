@@ -0,0 +1,244 @@
+"""SceneFileWriter used by the deck renderer."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import numpy as np
+from manim import RendererType, __version__, config, logger
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_webm_format, write_to_movie
+
+from .pipeline import FramePipe
+from .sections import SectionCache
+from .slides import write_slides
+
+
+class DeckFileWriter(SceneFileWriter):
+    section_cache = None
+    # runs of identical frames at least this long are encoded as one frame
+    # repeated by ffmpeg (tpad), in a segment of the partial of their own
+    hold_segment_seconds = 1.0
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        if DeckFileWriter.section_cache is None and not config.disable_caching:
+            DeckFileWriter.section_cache = SectionCache()
+        # frames reach ffmpeg through a writer thread (deck.pipeline)
+        self.frame_pipe = FramePipe(getattr(renderer, "frame_queue_depth", 4))
+        # counts every section opened, including the first, empty one
+        self.sections_opened = 0
+        super().__init__(renderer, scene_name, **kwargs)
+
+    @property
+    def shard(self):
+        return getattr(self.renderer, "shard", None)
+
+    def next_section(self, name, type, skip_animations):
+        if self.shard is not None:
+            index, count = self.shard
+            # the other shards render this one
+            skip_animations = skip_animations or self.sections_opened % count != index
+        self.sections_opened += 1
+        super().next_section(name, type, skip_animations)
+
+    def is_already_cached(self, hash_invocation):
+        if super().is_already_cached(hash_invocation):
+            return True
+        if self.section_cache is None or not hasattr(self, "partial_movie_directory"):
+            return False
+        path = self.partial_movie_directory / f"{hash_invocation}{config.movie_file_extension}"
+        return self.section_cache.fetch_partial(hash_invocation, path)
+
+    def open_movie_pipe(self, file_path=None):
+        # ffmpeg is started on the first change of frame, so that a partial
+        # that is one frame held for its whole duration (a wait) is piped to
+        # ffmpeg once instead of once per frame
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        self.writing_process = None
+        self.held_frame = None
+        self.held_count = 0
+        # files the partial is written in, joined when it is closed
+        self.segments = []
+
+    def write_frame(self, frame_or_renderer):
+        if config.renderer != RendererType.CAIRO or not write_to_movie():
+            super().write_frame(frame_or_renderer)
+            self.held_frame = frame_or_renderer
+            return
+        self.flush_held_frame()
+        if self.frame_pipe.owns(frame_or_renderer):
+            # drawn in a buffer of the pipe (frame_buffer), written as is
+            self.held_frame = frame_or_renderer
+        else:
+            self.held_frame = self.frame_pipe.acquire(frame_or_renderer)
+            np.copyto(self.held_frame, frame_or_renderer)
+        self.held_count = 1
+
+    def frame_buffer(self, like):
+        """A buffer of the frame pipe to rasterize the next frame into.
+
+        The frame written last is queued first, so the buffer may be that
+        one, or one of the frames before it. Returns None when frames are
+        not piped, e.g. for ``-s``.
+        """
+        if config.renderer != RendererType.CAIRO or not write_to_movie():
+            return None
+        self.flush_held_frame()
+        return self.frame_pipe.acquire(like)
+
+    def hold_frame(self, num_frames=1):
+        """Repeat the last frame written ``num_frames`` more times."""
+        if config.renderer != RendererType.CAIRO or not write_to_movie():
+            for _ in range(num_frames):
+                super().write_frame(self.held_frame)
+            return
+        self.held_count += num_frames
+
+    def flush_held_frame(self):
+        if not self.held_count:
+            return
+        if self.held_count > 1 and self.held_count >= self.hold_segment_seconds * config["frame_rate"]:
+            self.write_held_segment()
+            return
+        if self.writing_process is None:
+            self.start_movie_pipe()
+        self.frame_pipe.submit(self.held_frame, self.held_count)
+        self.held_frame = None
+        self.held_count = 0
+
+    def write_held_segment(self):
+        """Encode the held frame and its repeats as a segment of their own."""
+        self.end_segment()
+        self.start_movie_pipe(hold_frames=self.held_count)
+        self.frame_pipe.submit(self.held_frame)
+        self.end_segment()
+        self.held_frame = None
+        self.held_count = 0
+
+    def start_movie_pipe(self, hold_frames=1):
+        """Start ffmpeg on the next segment of ``partial_movie_file_path``.
+
+        With ``hold_frames`` > 1, ffmpeg reads a single frame and repeats it
+        (tpad) that many times. Every segment keeps the constant frame rate
+        and codec settings of the partials, so they all concatenate with
+        ``-c copy``.
+        """
+        path = Path(self.partial_movie_file_path)
+        segment = path.with_name(f"{path.stem}.{len(self.segments)}{path.suffix}")
+        self.segments.append(segment)
+        fps = config["frame_rate"]
+        if fps == int(fps):
+            fps = int(fps)
+        camera = self.renderer.camera
+        # same command as SceneFileWriter.open_movie_pipe (Cairo only), sized
+        # by the camera so deck.resolutions can encode other resolutions
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "rawvideo",
+            "-s", "%dx%d" % (camera.pixel_width, camera.pixel_height),
+            "-pix_fmt", "rgba",
+            "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-loglevel", config["ffmpeg_loglevel"].lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+        ]
+        if hold_frames > 1:
+            command += ["-vf", f"tpad=stop_mode=clone:stop={hold_frames - 1}"]
+        if is_webm_format():
+            command += ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        elif config["transparent"]:
+            command += ["-vcodec", "qtrle"]
+        else:
+            command += ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+        command += [str(segment)]
+        self.writing_process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.frame_pipe.start(self.writing_process.stdin)
+
+    def end_segment(self):
+        """Wait until ffmpeg has written everything queued and close it."""
+        if self.writing_process is None:
+            return
+        self.frame_pipe.join()
+        self.writing_process.stdin.close()
+        self.writing_process.wait()
+        self.writing_process = None
+
+    def join_segments(self):
+        path = Path(self.partial_movie_file_path)
+        if len(self.segments) == 1:
+            os.replace(self.segments[0], path)
+            return
+        file_list = path.with_name(f"{path.stem}.segments.txt")
+        with file_list.open("w", encoding="utf-8") as file:
+            for segment in self.segments:
+                file.write(f"file 'file:{segment.as_posix()}'\n")
+        # as SceneFileWriter.combine_files
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(file_list),
+            "-loglevel", config.ffmpeg_loglevel.lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+            "-nostdin",
+            "-c", "copy",
+            "-an",
+            str(path),
+        ]
+        subprocess.run(command, check=True)
+        file_list.unlink()
+        for segment in self.segments:
+            segment.unlink(missing_ok=True)
+
+    def close_movie_pipe(self):
+        if self.writing_process is None and not self.segments and self.held_count > 1:
+            # the whole partial is one frame (a wait)
+            self.write_held_segment()
+        self.flush_held_frame()
+        if not self.segments:
+            # nothing was written; let ffmpeg fail the way it always did
+            self.start_movie_pipe()
+        self.end_segment()
+        self.join_segments()
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+        if self.section_cache is not None:
+            path = Path(self.partial_movie_file_path)
+            self.section_cache.store_partial(path.stem, path)
+
+    def finish(self):
+        if self.shard is not None:
+            # the partial movies are combined by the render joining the shards
+            return
+        super().finish()
+
+    def combine_to_section_videos(self):
+        self.finish_last_section()
+        sections_index = []
+        for section in self.sections:
+            if section.video is None:
+                continue
+            output = self.sections_output_dir / section.video
+            if self.section_cache is not None and self.section_cache.fetch_section(section, output):
+                logger.info(f"Section '{section.name}' unchanged, reusing cached video")
+            else:
+                logger.info(f"Combining partial files for section '{section.name}'")
+                self.combine_files(section.get_clean_partial_movie_files(), output)
+                if self.section_cache is not None:
+                    self.section_cache.store_section(section, output)
+            sections_index.append(section.get_dict(self.sections_output_dir))
+        with (self.sections_output_dir / f"{self.output_name}.json").open("w") as file:
+            json.dump(sections_index, file, indent=4)
+        # fragmented MP4 only; transparent .mov and .webm renders are skipped
+        if (getattr(self.renderer, "slides", False) and sections_index
+                and config.movie_file_extension == ".mp4"):
+            logger.info("Writing single-file slides movie")
+            write_slides(sections_index, self.sections_output_dir, self.output_name)
@@ -0,0 +1,123 @@
+from deck.animation_checks import play_problems
+
+
+class Mob:
+    def __init__(self, name, *submobjects):
+        self.name = name
+        self.submobjects = list(submobjects)
+
+    def get_family(self):
+        return [self] + [mob for sub in self.submobjects for mob in sub.get_family()]
+
+    def __str__(self):
+        return self.name
+
+
+class Anim:
+    def __init__(self, mobject, introducer=False, remover=False, animations=()):
+        self.mobject = mobject
+        self.introducer = introducer
+        self.remover = remover
+        self.animations = list(animations)
+
+    def is_introducer(self):
+        return self.introducer
+
+    def is_remover(self):
+        return self.remover
+
+
+class FadeOut(Anim):
+    def __init__(self, mobject):
+        super().__init__(mobject, remover=True)
+
+
+class Write(Anim):
+    def __init__(self, mobject):
+        super().__init__(mobject, introducer=True)
+
+
+class ShowPassingFlash(Anim):
+    def __init__(self, mobject):
+        super().__init__(mobject, introducer=True, remover=True)
+
+
+class AnimationGroup(Anim):
+    def __init__(self, *animations, group=None, introducer=False):
+        if group is None:
+            group = Mob("group", *[animation.mobject for animation in animations])
+        super().__init__(group, introducer=introducer, animations=animations)
+
+
+def test_remover_of_absent_mobject():
+    circle = Mob("circle")
+
+    assert play_problems([FadeOut(circle)], [], 3) == [
+        "play 3: FadeOut of Mob 'circle', which is not in the scene"
+    ]
+
+
+def test_introducer_of_present_mobject():
+    circle = Mob("circle")
+
+    assert play_problems([Write(circle)], [circle], 1) == [
+        "play 1: Write of Mob 'circle', which is already in the scene"
+    ]
+
+
+def test_introducer_of_present_mobject_inside_a_group():
+    circle = Mob("circle")
+
+    problems = play_problems([AnimationGroup(Write(circle))], [circle], 2)
+
+    assert problems == ["play 2: Write of Mob 'circle', which is already in the scene"]
+
+
+def test_valid_play_has_no_problems():
+    circle, square = Mob("circle"), Mob("square")
+
+    assert play_problems([FadeOut(circle), Write(square)], [circle], 1) == []
+
+
+def test_nested_animations_are_checked():
+    circle, square = Mob("circle"), Mob("square")
+    group = AnimationGroup(FadeOut(circle), Write(square), introducer=True)
+
+    problems = play_problems([group], [square], 1)
+
+    assert len(problems) == 1 and "Write of Mob 'square'" in problems[0]
+
+
+def test_animations_that_introduce_and_remove_are_skipped():
+    dot = Mob("dot")
+
+    assert play_problems([ShowPassingFlash(dot)], [dot], 1) == []
+    assert play_problems([ShowPassingFlash(dot)], [], 1) == []
+
+
+def test_flash_removes_the_lines_its_group_brings_in():
+    dot = Mob("dot")
+    lines = Mob("lines", *[Mob(f"line {n}") for n in range(12)])
+    flash = AnimationGroup(*[ShowPassingFlash(line) for line in lines.submobjects], group=lines)
+    fade_lines = AnimationGroup(*[FadeOut(line) for line in lines.submobjects], group=lines)
+
+    assert play_problems([flash], [dot], 1) == []
+    assert play_problems([fade_lines], [dot], 1) == []
+
+
+def test_nested_group_only_counts_when_it_is_an_introducer():
+    lines = Mob("lines", Mob("line"))
+    inner = AnimationGroup(FadeOut(lines.submobjects[0]), group=lines)
+    outer = AnimationGroup(inner, group=Mob("outer"), introducer=True)
+
+    assert len(play_problems([outer], [], 1)) == 1
+    inner.introducer = True
+    assert play_problems([outer], [], 1) == []
+
+
+def test_stacked_points_animations_are_skipped():
+    plane = Mob("plane")
+    transform = Anim(plane, introducer=True)
+    transform.targets = [plane]
+
+    assert play_problems([transform], [plane], 1) == []
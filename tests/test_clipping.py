@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from deck.clipping import clip_segments
+
+VIEWPORT = (-2.0, 2.0, -1.0, 1.0)
+
+
+def clip(*segments):
+    segments = np.array(segments, dtype=float)
+    return clip_segments(segments[:, 0], segments[:, 1], VIEWPORT)
+
+
+def test_segment_inside_is_kept_whole():
+    keep, t0, t1 = clip([(-1, 0), (1, 0.5)])
+
+    assert keep.tolist() == [True]
+    assert (t0[0], t1[0]) == (0, 1)
+
+
+def test_segment_crossing_the_viewport_is_cut_at_its_edges():
+    keep, t0, t1 = clip([(-4, 0), (4, 0)], [(0, -3), (0, 3)])
+
+    assert keep.tolist() == [True, True]
+    np.testing.assert_allclose(t0, [0.25, 1 / 3])
+    np.testing.assert_allclose(t1, [0.75, 2 / 3])
+
+
+def test_diagonal_segment_through_a_corner_region():
+    keep, t0, t1 = clip([(0, 0), (4, 4)])
+
+    # leaves through the top edge (y = 1) before reaching x = 2
+    assert keep.tolist() == [True]
+    assert t0[0] == 0
+    assert t1[0] == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("segment", [
+    [(-4, 2), (4, 2)],      # parallel to the x axis, above
+    [(3, -4), (3, 4)],      # parallel to the y axis, to the right
+    [(-5, -1.5), (-1, -3)],  # below, slanted
+    [(1, 3), (5, -0.5)],    # passes by the top right corner
+])
+def test_segments_outside_are_dropped(segment):
+    keep, _, _ = clip(segment)
+
+    assert keep.tolist() == [False]
+
+
+def test_extra_columns_are_ignored():
+    starts = np.array([[-4.0, 0.0, 7.0]])
+    ends = np.array([[4.0, 0.0, -7.0]])
+
+    keep, t0, t1 = clip_segments(starts, ends, VIEWPORT)
+
+    assert keep.tolist() == [True]
+    np.testing.assert_allclose([t0[0], t1[0]], [0.25, 0.75])
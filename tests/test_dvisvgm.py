@@ -0,0 +1,32 @@
+import pytest
+
+from deck.dvisvgm import assign_pages, page_files
+
+
+def test_pages_are_ordered_by_number(tmp_path):
+    for number in [10, 2, 1, 9]:
+        (tmp_path / f"page-{number}.svg").write_text(str(number))
+    (tmp_path / "batch.tex").write_text("")
+
+    assert [path.name for path in page_files(tmp_path)] == [
+        "page-1.svg", "page-2.svg", "page-9.svg", "page-10.svg"
+    ]
+
+
+def test_expressions_get_the_pages_in_order(tmp_path):
+    for number in range(1, 12):
+        (tmp_path / f"page-{number}.svg").write_text(str(number))
+    expressions = [f"x^{n}" for n in range(1, 12)]
+
+    assigned = assign_pages(expressions, page_files(tmp_path))
+
+    assert [(expression, page.read_text()) for expression, page in assigned] == [
+        (f"x^{n}", str(n)) for n in range(1, 12)
+    ]
+
+
+def test_page_count_mismatch(tmp_path):
+    (tmp_path / "page-1.svg").write_text("")
+
+    with pytest.raises(ValueError, match="1 pages for 2 expressions"):
+        assign_pages(["a", "b"], page_files(tmp_path))
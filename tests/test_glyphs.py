@@ -0,0 +1,32 @@
+import pytest
+
+from deck.glyphs import matrix_source, split_glyphs
+
+COLUMNS = [["2", "-1"], ["10", "3"]]
+
+
+def test_source_lists_entries_column_by_column():
+    assert matrix_source(COLUMNS) == r"[\quad 2\quad -1\quad 10\quad 3\quad ]"
+
+
+def test_glyphs_are_split_into_brackets_and_entries():
+    glyphs = ["[", "2", "-", "1", "1", "0", "3", "]"]
+
+    left, cells, right = split_glyphs(glyphs, COLUMNS)
+
+    assert (left, right) == ("[", "]")
+    assert cells == [[["2"], ["-", "1"]], [["1", "0"], ["3"]]]
+
+
+def test_glyphs_are_not_consumed():
+    glyphs = ["[", "2", "-", "1", "1", "0", "3", "]"]
+
+    split_glyphs(glyphs, COLUMNS)
+
+    assert len(glyphs) == 8
+
+
+@pytest.mark.parametrize("count", [7, 9])
+def test_glyph_count_must_match_the_entries(count):
+    with pytest.raises(ValueError, match="expected 8 glyphs"):
+        split_glyphs(["x"] * count, COLUMNS)
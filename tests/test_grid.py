@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from deck.grid import CompactPlane  # noqa: E402
+from deck.transforms import ApplyPointsFunction  # noqa: E402
+
+RANGES = {"x_range": (-4, 4, 1), "y_range": (-3, 3, 1), "faded_line_ratio": 2}
+
+
+def warp(points):
+    # works on one point (apply_function) and on an (N, 3) array alike
+    points = np.asarray(points, dtype=float)
+    return points + 0.1 * points[..., [1]] ** 2 * manim.RIGHT + 0.05 * np.sin(points[..., [0]]) * manim.UP
+
+
+def sorted_lines(lines):
+    """The lines, each an array of points, in an order that ignores how they were listed."""
+    return sorted((np.round(line, 6) for line in lines), key=lambda line: line.ravel().tolist())
+
+
+def number_plane_layers(plane):
+    return {
+        "faded_lines": [line.points for line in plane.faded_lines],
+        "background_lines": [line.points for line in plane.background_lines],
+        "axes": [axis.points for axis in plane.axes],
+    }
+
+
+def compact_plane_layers(plane, curves_per_line):
+    return {
+        name: np.split(layer.points, len(layer.points) // (4 * curves_per_line))
+        for name, layer in [
+            ("faded_lines", plane.faded_lines),
+            ("background_lines", plane.background_lines),
+            ("axes", plane.axes),
+        ]
+    }
+
+
+@pytest.fixture
+def number_plane():
+    plane = manim.NumberPlane(**RANGES).prepare_for_nonlinear_transform()
+    return plane.apply_function(warp)
+
+
+def assert_same_lines(compact, number_plane):
+    expected = number_plane_layers(number_plane)
+    actual = compact_plane_layers(compact, 50)
+    for name in expected:
+        assert len(actual[name]) == len(expected[name]), name
+        for got, want in zip(sorted_lines(actual[name]), sorted_lines(expected[name])):
+            np.testing.assert_allclose(got, want, atol=1e-6, err_msg=name)
+
+
+def test_apply_function_matches_number_plane(number_plane):
+    compact = CompactPlane(**RANGES).prepare_for_nonlinear_transform()
+    compact.apply_function(warp)
+    assert_same_lines(compact, number_plane)
+
+
+def test_apply_points_function_matches_number_plane(number_plane):
+    compact = CompactPlane(**RANGES).prepare_for_nonlinear_transform()
+    animation = ApplyPointsFunction(warp, compact)
+    animation.begin()
+    animation.finish()
+    assert_same_lines(compact, number_plane)
+
+
+@pytest.mark.parametrize("warped", [False, True])
+def test_coords_to_point_matches_number_plane(number_plane, warped):
+    compact = CompactPlane(**RANGES).prepare_for_nonlinear_transform()
+    expected = number_plane
+    if warped:
+        compact.apply_function(warp)
+    else:
+        expected = manim.NumberPlane(**RANGES).prepare_for_nonlinear_transform()
+    for coords in [(0, 0), (1, 2), (-3, -1), (4, 3)]:
+        np.testing.assert_allclose(compact.c2p(*coords), expected.c2p(*coords), atol=1e-6)
@@ -0,0 +1,71 @@
+import struct
+
+import pytest
+
+from deck.mp4 import read_fragments
+
+
+def box(box_type, *children, large=False):
+    body = b"".join(children)
+    if large:
+        # 64-bit size after the type
+        return struct.pack(">I4sQ", 1, box_type.encode(), 16 + len(body)) + body
+    return struct.pack(">I4s", 8 + len(body), box_type.encode()) + body
+
+
+def mdhd(timescale, version=0):
+    if version == 1:
+        return box("mdhd", bytes([1, 0, 0, 0]), struct.pack(">QQIQ", 0, 0, timescale, 0))
+    return box("mdhd", bytes(4), struct.pack(">IIII", 0, 0, timescale, 0))
+
+
+def moof(decode_time, version=0):
+    time = struct.pack(">Q" if version == 1 else ">I", decode_time)
+    tfdt = box("tfdt", bytes([version, 0, 0, 0]), time)
+    return box("moof", box("mfhd", bytes(8)), box("traf", box("tfhd", bytes(8)), tfdt))
+
+
+def write_movie(path, timescale, decode_times, mdhd_version=0, large_mdat=False):
+    track = box("trak", box("tkhd", bytes(84)), box("mdia", mdhd(timescale, mdhd_version)))
+    head = box("ftyp", b"isom", bytes(4)) + box("moov", box("mvhd", bytes(100)), track)
+    data = head
+    offsets = []
+    for index, decode_time in enumerate(decode_times):
+        offsets.append(len(data))
+        data += moof(decode_time, version=index % 2)
+        data += box("mdat", bytes(50 + index), large=large_mdat)
+    path.write_bytes(data)
+    return len(head), offsets
+
+
+@pytest.mark.parametrize("mdhd_version", [0, 1])
+def test_fragments_are_indexed_by_moof_offset_and_decode_time(tmp_path, mdhd_version):
+    path = tmp_path / "slides.mp4"
+    init_size, offsets = write_movie(path, 15360, [0, 30720, 76800], mdhd_version)
+
+    assert read_fragments(path) == (
+        init_size, 15360, [(offsets[0], 0.0), (offsets[1], 2.0), (offsets[2], 5.0)]
+    )
+
+
+def test_large_boxes_are_skipped_by_their_64_bit_size(tmp_path):
+    path = tmp_path / "slides.mp4"
+    _, offsets = write_movie(path, 1000, [0, 1500], large_mdat=True)
+
+    assert [offset for offset, _ in read_fragments(path)[2]] == offsets
+
+
+def test_movie_without_video_track(tmp_path):
+    path = tmp_path / "empty.mp4"
+    path.write_bytes(box("ftyp", b"isom", bytes(4)) + box("moov", box("mvhd", bytes(100))))
+
+    with pytest.raises(ValueError, match="no video track"):
+        read_fragments(path)
+
+
+def test_corrupt_box_size(tmp_path):
+    path = tmp_path / "corrupt.mp4"
+    path.write_bytes(box("ftyp", b"isom", bytes(4)) + struct.pack(">I4s", 4, b"moov"))
+
+    with pytest.raises(ValueError, match="corrupt MP4 box"):
+        read_fragments(path)
@@ -0,0 +1,115 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from deck.pipeline import FramePipe
+
+
+class SlowStream(io.BytesIO):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return super().write(data)
+
+
+class BrokenStream:
+    def write(self, data):
+        raise BrokenPipeError("ffmpeg exited")
+
+
+def frame(value, shape=(2, 3, 4)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_depth_must_be_positive():
+    with pytest.raises(ValueError):
+        FramePipe(0)
+
+
+def test_frames_are_written_in_order_and_repeated():
+    pipe = FramePipe(depth=2)
+    stream = io.BytesIO()
+    pipe.start(stream)
+    for value, count in [(1, 1), (2, 3), (3, 1)]:
+        buffer = pipe.acquire(frame(0))
+        buffer[:] = value
+        pipe.submit(buffer, count)
+    pipe.join()
+
+    written = np.frombuffer(stream.getvalue(), dtype=np.uint8).reshape(-1, 24)
+    assert written[:, 0].tolist() == [1, 2, 2, 2, 3]
+
+
+def test_buffers_are_reused_and_owned():
+    pipe = FramePipe(depth=2)
+    pipe.start(io.BytesIO())
+    seen = set()
+    for _ in range(6):
+        buffer = pipe.acquire(frame(0))
+        assert pipe.owns(buffer)
+        seen.add(id(buffer))
+        pipe.submit(buffer)
+    pipe.join()
+
+    assert len(seen) <= 2
+    assert not pipe.owns(frame(0))
+
+
+def test_buffers_follow_the_frame_shape():
+    pipe = FramePipe(depth=1)
+    small = pipe.acquire(frame(0))
+    pipe.release(small)
+
+    large = pipe.acquire(frame(0, shape=(4, 5, 4)))
+
+    assert large.shape == (4, 5, 4) and large.flags.c_contiguous
+    assert pipe.owns(large) and not pipe.owns(small)
+
+
+def test_stall_counts_waiting_for_the_writer():
+    pipe = FramePipe(depth=1)
+    pipe.start(SlowStream(0.05))
+    pipe.submit(pipe.acquire(frame(0)))
+
+    # the only buffer is with the writer until it has written it
+    pipe.release(pipe.acquire(frame(0)))
+    pipe.join()
+
+    assert pipe.stall >= 0.03
+
+
+def test_starve_counts_waiting_for_frames():
+    pipe = FramePipe(depth=2)
+    pipe.start(io.BytesIO())
+    time.sleep(0.05)
+    pipe.submit(pipe.acquire(frame(0)))
+    pipe.join()
+
+    assert pipe.starve >= 0.03
+    assert pipe.stall == 0
+
+
+def test_writer_errors_are_raised_on_the_rendering_thread():
+    pipe = FramePipe(depth=2)
+    pipe.start(BrokenStream())
+    pipe.submit(pipe.acquire(frame(0)))
+
+    with pytest.raises(BrokenPipeError):
+        pipe.join()
+    # the buffer came back despite the error
+    assert pipe.free.qsize() == 2
+
+
+def test_join_stops_the_writer_thread():
+    pipe = FramePipe(depth=1)
+    pipe.start(io.BytesIO())
+    pipe.join()
+
+    assert pipe.thread is None
+    assert not any(thread.name == "deck-frame-writer" for thread in threading.enumerate())
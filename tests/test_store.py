@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from deck.store import DiskStore, content_hash
+
+
+def key(n):
+    return content_hash(str(n))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DiskStore("test", root=tmp_path, max_bytes=1000, suffix=".bin")
+
+
+def age(store, keys):
+    # oldest first, a second apart, as if read in that order
+    for seconds, k in enumerate(keys):
+        os.utime(store.path_for(k), (1000 + seconds, 1000 + seconds))
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("ab", "c") == content_hash(b"ab", b"c")
+
+
+def test_put_and_read(store):
+    path = store.put_bytes(key(1), b"hello")
+
+    assert path == store.path_for(key(1))
+    assert path.suffix == ".bin"
+    assert store.read_bytes(key(1)) == b"hello"
+    assert store.read_bytes(key(2)) is None
+    assert store.stats() == {"hits": 1, "misses": 1}
+
+
+def test_put_file_and_fetch(store, tmp_path):
+    source = tmp_path / "source.svg"
+    source.write_text("<svg/>")
+    store.put_file(key(1), source)
+    destination = tmp_path / "out" / "copy.svg"
+
+    assert store.fetch(key(1), destination)
+    assert destination.read_text() == "<svg/>"
+    assert not store.fetch(key(2), tmp_path / "out" / "missing.svg")
+    assert not (tmp_path / "out" / "missing.svg").exists()
+
+
+def test_get_marks_entries_as_recently_used(store):
+    for n in range(3):
+        store.put_bytes(key(n), bytes(300))
+    age(store, [key(0), key(1), key(2)])
+    store.get(key(0))
+
+    store.put_bytes(key(3), bytes(300))
+
+    # 1200 bytes, evicted down to 900: the least recently used goes
+    assert store.get(key(1)) is None
+    assert all(store.get(key(n)) is not None for n in (0, 2, 3))
+
+
+def test_evict_down_to_ninety_percent(store):
+    for n in range(3):
+        store.put_bytes(key(n), bytes(300))
+    age(store, [key(0), key(1), key(2)])
+    store.max_bytes = 500
+
+    store.evict()
+
+    assert [store.get(key(n)) is not None for n in range(3)] == [False, False, True]
+    assert store.size == 300
+
+
+def test_puts_below_the_limit_do_not_rescan(store, monkeypatch):
+    scans = []
+    evict = store.evict
+    monkeypatch.setattr(store, "evict", lambda: scans.append(1) or evict())
+    store.max_bytes = 10_000
+
+    for n in range(50):
+        store.put_bytes(key(n), bytes(10))
+
+    # the first put and then every 1000 bytes written
+    assert len(scans) == 1
+    assert store.size == 500
+    for n in range(50, 150):
+        store.put_bytes(key(n), bytes(10))
+    assert len(scans) == 2
+
+
+def test_other_writers_are_picked_up_after_a_tenth_of_the_limit(store, tmp_path):
+    other = DiskStore("test", root=tmp_path, max_bytes=1000, suffix=".bin")
+    store.put_bytes(key(0), bytes(50))
+    for n in range(1, 10):
+        other.put_bytes(key(n), bytes(100))
+    assert store.size == 50
+
+    # written since the last scan: 50, then 100 bytes; the second put rescans
+    store.put_bytes(key(10), bytes(50))
+    assert store.size == 100
+    store.put_bytes(key(11), bytes(50))
+
+    assert store.size <= 900
+    assert store.get(key(11)) is not None